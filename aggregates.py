@@ -0,0 +1,157 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from results_io import order_labels
+
+GENDERS = ["남", "여"]
+
+# 나이 = 올해 - 출생 연도 (기존 대시보드 기준 유지)
+AGE_BINS = [-np.inf, 23, 27, 30, np.inf]
+AGE_GROUPS = ["20대 초반", "20대 중반", "20대 후반", "30대 이상"]
+
+
+def parse_birth_dates(births, today=None):
+    # "2002.03.30", "2003.07.01.", "19990502", "2002-03-30", "021206"(YYMMDD) 를 한 번에 날짜로 변환
+    # 읽을 수 없는 값은 NaT
+    today = today or datetime.date.today()
+    digits = pd.Series(births, dtype="string").str.replace(r"\D", "", regex=True)
+
+    # 6자리는 앞 두 자리를 연도로 보고, 올해 끝 두 자리보다 크면 1900년대로 처리
+    short = (digits.str.len() == 6).fillna(False).astype(bool)
+    older = (
+        (pd.to_numeric(digits.str[:2], errors="coerce") > today.year % 100)
+        .fillna(False)
+        .astype(bool)
+    )
+    digits = digits.mask(short & older, "19" + digits).mask(
+        short & ~older, "20" + digits
+    )
+
+    return pd.to_datetime(digits, format="%Y%m%d", errors="coerce")
+
+
+def age_groups(birth_dates, year):
+    ages = year - birth_dates.dt.year
+    groups = pd.cut(ages, AGE_BINS, right=False, labels=AGE_GROUPS)
+    counts = groups.value_counts().reindex(AGE_GROUPS, fill_value=0)
+    return {label: int(count) for label, count in counts.items()}
+
+
+def score_distributions(results):
+    # 평가 항목별 점수 분포 {항목: {점수: 인원}} - 점수는 SCORE_ORDER 순서
+    rows = [
+        (category, data["score"])
+        for result in results
+        for category, data in result.get("evaluation_result", {}).items()
+        if "score" in data
+    ]
+    if not rows:
+        return {}
+    counts = pd.DataFrame(rows, columns=["category", "score"]).value_counts()
+    distributions = {}
+    for category in dict.fromkeys(category for category, _ in rows):
+        scores = counts[category]
+        distributions[category] = {
+            label: int(scores[label]) for label in order_labels(scores.index)
+        }
+    return distributions
+
+
+def build_aggregates(results, today=None):
+    # 데이터 버전마다 한 번만 계산해서 모든 페이지와 세션이 같이 사용
+    today = today or datetime.date.today()
+    frame = pd.DataFrame(
+        {
+            "sex": [result.get("user_sex") for result in results],
+            "birth": [result.get("user_birth") for result in results],
+        }
+    )
+    birth_dates = parse_birth_dates(frame["birth"], today)
+
+    gender_counts = frame["sex"].value_counts()
+    genders = GENDERS + sorted(set(gender_counts.index) - set(GENDERS))
+
+    return {
+        "total": len(results),
+        "gender_counts": {
+            gender: int(gender_counts.get(gender, 0)) for gender in genders
+        },
+        "age_groups": age_groups(birth_dates, today.year),
+        "unparsed_births": int(birth_dates.isna().sum()),
+        "score_distributions": score_distributions(results),
+    }
+
+
+def build_overview_frame(results, today=None):
+    # 전체 지원자 보기용 표 - 인덱스는 results 안의 위치, 점수와 성별은 범주형
+    today = today or datetime.date.today()
+    names = pd.Series(
+        [result.get("user_name", "") for result in results], dtype="string"
+    )
+    births = pd.Series(
+        [result.get("user_birth", "") for result in results], dtype="string"
+    )
+    birth_dates = parse_birth_dates(births, today)
+
+    frame = pd.DataFrame(
+        {
+            "이름": names,
+            "성별": pd.Categorical([result.get("user_sex") for result in results]),
+            "생년월일": births,
+            "문항 수": np.array(
+                [len(result.get("summarization", {})) for result in results],
+                dtype=np.int32,
+            ),
+            "name_lower": names.str.lower(),
+            # 정렬 키는 미리 순위(정수)로 만들어 둠 - 생년월일은 날짜 기준, 읽을 수 없는 값은 맨 뒤
+            "name_key": pd.factorize(names, sort=True)[0].astype(np.int64),
+            "birth_key": birth_dates.rank(method="dense", na_option="bottom").astype(
+                np.int64
+            ),
+        }
+    )
+
+    categories = list(
+        dict.fromkeys(
+            category
+            for result in results
+            for category in result.get("evaluation_result", {})
+        )
+    )
+    for category in categories:
+        scores = [
+            result.get("evaluation_result", {}).get(category, {}).get("score")
+            for result in results
+        ]
+        frame[category] = pd.Categorical(
+            scores,
+            categories=order_labels(score for score in scores if score),
+            ordered=True,
+        )
+    frame.attrs["score_columns"] = categories
+    return frame
+
+
+def filter_overview(frame, sex=None, name=None, scores=None):
+    # 조건별 불리언 마스크를 합쳐서 한 번에 선택
+    mask = np.ones(len(frame), dtype=bool)
+    if sex:
+        mask &= (frame["성별"] == sex).to_numpy()
+    if name:
+        mask &= (
+            frame["name_lower"]
+            .str.contains(name.lower(), regex=False)
+            .fillna(False)
+            .to_numpy(dtype=bool)
+        )
+    for category, selected in (scores or {}).items():
+        if selected:
+            mask &= frame[category].isin(selected).to_numpy()
+    return frame[mask]
+
+
+def sort_overview(frame, key, descending=False):
+    # key: "name_key" 또는 "birth_key" (같은 값이면 원래 순서 유지)
+    return frame.sort_values(key, ascending=not descending, kind="stable")
@@ -0,0 +1,284 @@
+import argparse
+import csv
+import json
+import os
+from itertools import combinations
+
+import numpy as np
+
+from results_io import applicant_key, iter_results, order_labels
+
+
+def align_runs(runs):
+    # runs: [결과 리스트, ...] -> 지원자 키 목록, 평가 항목별 (실행 수 x 지원자 수) 점수 코드 행렬
+    keys = []
+    key_index = {}
+    for results in runs:
+        for result in results:
+            key = applicant_key(result)
+            if key not in key_index:
+                key_index[key] = len(keys)
+                keys.append(key)
+
+    raw = {}
+    labels = {}
+    for r, results in enumerate(runs):
+        seen = set()
+        for result in results:
+            key = applicant_key(result)
+            # 같은 실행 안의 중복 지원자는 첫 번째 결과만 사용
+            if key in seen:
+                continue
+            seen.add(key)
+            for category, data in result.get("evaluation_result", {}).items():
+                if "score" not in data:
+                    continue
+                raw.setdefault(category, []).append((r, key_index[key], data["score"]))
+                labels.setdefault(category, set()).add(data["score"])
+
+    codes = {}
+    for category, entries in raw.items():
+        labels[category] = order_labels(labels[category])
+        label_index = {label: i for i, label in enumerate(labels[category])}
+        matrix = np.full((len(runs), len(keys)), -1, dtype=np.int16)
+        entries = np.array(
+            [(r, k, label_index[s]) for r, k, s in entries], dtype=np.int64
+        ).reshape(-1, 3)
+        matrix[entries[:, 0], entries[:, 1]] = entries[:, 2]
+        codes[category] = matrix
+
+    return keys, codes, labels
+
+
+def confusion_matrix(a, b, n_labels):
+    # 두 실행 모두 점수가 있는 지원자만 비교
+    mask = (a >= 0) & (b >= 0)
+    flat = a[mask].astype(np.int64) * n_labels + b[mask]
+    return np.bincount(flat, minlength=n_labels * n_labels).reshape(n_labels, n_labels)
+
+
+def cohens_kappa(cm):
+    n = cm.sum()
+    if n == 0:
+        return None
+    po = np.trace(cm) / n
+    pe = (cm.sum(axis=0) * cm.sum(axis=1)).sum() / (n * n)
+    # 모든 평가가 한 점수로만 나온 경우 kappa 는 정의되지 않음
+    if pe >= 1:
+        return None
+    return float((po - pe) / (1 - pe))
+
+
+def fleiss_kappa(matrix, n_labels):
+    # 모든 실행에서 점수가 있는 지원자만 사용 (평가자 수가 같아야 함)
+    complete = matrix[:, (matrix >= 0).all(axis=0)]
+    n_raters, n_subjects = complete.shape
+    if n_raters < 2 or n_subjects == 0:
+        return None
+    subject = np.broadcast_to(np.arange(n_subjects), complete.shape)
+    counts = np.bincount(
+        (subject * n_labels + complete).ravel(), minlength=n_subjects * n_labels
+    ).reshape(n_subjects, n_labels)
+    p_j = counts.sum(axis=0) / (n_subjects * n_raters)
+    p_i = ((counts * (counts - 1)).sum(axis=1)) / (n_raters * (n_raters - 1))
+    p_bar = p_i.mean()
+    pe = (p_j**2).sum()
+    if pe >= 1:
+        return None
+    return float((p_bar - pe) / (1 - pe))
+
+
+def distribution(row, labels):
+    valid = row[row >= 0]
+    counts = np.bincount(valid, minlength=len(labels))
+    total = int(counts.sum())
+    return {
+        label: {"count": int(c), "ratio": (float(c) / total if total else 0.0)}
+        for label, c in zip(labels, counts)
+    }
+
+
+def build_report(paths, runs):
+    keys, codes, labels = align_runs(runs)
+    names = [os.path.basename(p) for p in paths]
+    # 파일 이름이 겹치면 전체 경로로 구분
+    if len(set(names)) < len(names):
+        names = list(paths)
+    report = {"runs": names, "applicants": len(keys), "criteria": {}}
+
+    for category, matrix in codes.items():
+        category_labels = labels[category]
+        n_labels = len(category_labels)
+
+        # 실행별 점수 분포와 첫 번째 실행 대비 분포 변화 (total variation distance)
+        distributions = [distribution(row, category_labels) for row in matrix]
+        ratios = np.array(
+            [[d[label]["ratio"] for label in category_labels] for d in distributions]
+        )
+        drift = (np.abs(ratios - ratios[0]).sum(axis=1) / 2).tolist()
+
+        pairs = []
+        for a, b in combinations(range(len(runs)), 2):
+            cm = confusion_matrix(matrix[a], matrix[b], n_labels)
+            n = int(cm.sum())
+            pairs.append(
+                {
+                    "run_a": names[a],
+                    "run_b": names[b],
+                    "n": n,
+                    "agreement": (float(np.trace(cm)) / n if n else None),
+                    "cohen_kappa": cohens_kappa(cm),
+                    "confusion_matrix": cm.tolist(),
+                }
+            )
+
+        # 실행 간 점수가 달라진 지원자 목록
+        present = matrix >= 0
+        low = np.where(present, matrix, np.iinfo(matrix.dtype).max).min(axis=0)
+        high = np.where(present, matrix, -1).max(axis=0)
+        flipped = np.nonzero((present.sum(axis=0) >= 2) & (low != high))[0]
+        flips = [
+            {
+                "applicant": keys[k],
+                "scores": {
+                    names[r]: (category_labels[c] if c >= 0 else None)
+                    for r, c in enumerate(matrix[:, k])
+                },
+            }
+            for k in flipped
+        ]
+
+        report["criteria"][category] = {
+            "labels": category_labels,
+            "distribution": dict(zip(names, distributions)),
+            "drift_from_first": dict(zip(names, drift)),
+            "fleiss_kappa": fleiss_kappa(matrix, n_labels),
+            "pairs": pairs,
+            "flips": flips,
+        }
+
+    return report
+
+
+def format_kappa(value):
+    return "-" if value is None else f"{value:.3f}"
+
+
+def print_report(report):
+    print(
+        f"=== 실행 간 일치도 ({len(report['runs'])}개 실행, 지원자 {report['applicants']}명) ==="
+    )
+    for category, data in report["criteria"].items():
+        print(f"\n{category}:")
+        print(f"  Fleiss' kappa: {format_kappa(data['fleiss_kappa'])}")
+        for run, dist in data["distribution"].items():
+            counts = ", ".join(f"{label} {d['count']}" for label, d in dist.items())
+            print(
+                f"  [{run}] {counts} (첫 실행 대비 변화 {data['drift_from_first'][run]:.1%})"
+            )
+        for pair in data["pairs"]:
+            agreement = "-" if pair["agreement"] is None else f"{pair['agreement']:.1%}"
+            print(
+                f"  {pair['run_a']} vs {pair['run_b']}: 일치율 {agreement}, "
+                f"Cohen's kappa {format_kappa(pair['cohen_kappa'])} (n={pair['n']})"
+            )
+            labels = data["labels"]
+            print("    " + " " * 6 + "".join(f"{label:>5}" for label in labels))
+            for label, row in zip(labels, pair["confusion_matrix"]):
+                print(f"    {label:>6}" + "".join(f"{c:>5}" for c in row))
+        print(f"  점수가 바뀐 지원자: {len(data['flips'])}명")
+        for flip in data["flips"]:
+            scores = " -> ".join(str(s) for s in flip["scores"].values())
+            print(f"    {flip['applicant']}: {scores}")
+
+
+def write_csv(report, directory):
+    os.makedirs(directory, exist_ok=True)
+
+    with open(
+        os.path.join(directory, "kappa.csv"), "w", encoding="utf-8-sig", newline=""
+    ) as f:
+        writer = csv.writer(f)
+        writer.writerow(
+            [
+                "criterion",
+                "run_a",
+                "run_b",
+                "n",
+                "agreement",
+                "cohen_kappa",
+                "fleiss_kappa",
+            ]
+        )
+        for category, data in report["criteria"].items():
+            for pair in data["pairs"]:
+                writer.writerow(
+                    [
+                        category,
+                        pair["run_a"],
+                        pair["run_b"],
+                        pair["n"],
+                        pair["agreement"],
+                        pair["cohen_kappa"],
+                        data["fleiss_kappa"],
+                    ]
+                )
+
+    with open(
+        os.path.join(directory, "confusion.csv"), "w", encoding="utf-8-sig", newline=""
+    ) as f:
+        writer = csv.writer(f)
+        writer.writerow(["criterion", "run_a", "run_b", "score_a", "score_b", "count"])
+        for category, data in report["criteria"].items():
+            for pair in data["pairs"]:
+                for label_a, row in zip(data["labels"], pair["confusion_matrix"]):
+                    for label_b, count in zip(data["labels"], row):
+                        writer.writerow(
+                            [
+                                category,
+                                pair["run_a"],
+                                pair["run_b"],
+                                label_a,
+                                label_b,
+                                count,
+                            ]
+                        )
+
+    with open(
+        os.path.join(directory, "flips.csv"), "w", encoding="utf-8-sig", newline=""
+    ) as f:
+        writer = csv.writer(f)
+        writer.writerow(["criterion", "applicant"] + report["runs"])
+        for category, data in report["criteria"].items():
+            for flip in data["flips"]:
+                writer.writerow(
+                    [category, flip["applicant"]]
+                    + [flip["scores"][run] for run in report["runs"]]
+                )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="여러 평가 결과 파일 간 일치도 비교")
+    parser.add_argument("files", nargs="+", help="평가 결과 파일 (.json, .jsonl, .gz)")
+    parser.add_argument("--json", help="JSON 리포트 저장 경로")
+    parser.add_argument("--csv", help="CSV 리포트 저장 디렉토리")
+    parser.add_argument("--quiet", action="store_true", help="콘솔 출력 생략")
+    args = parser.parse_args()
+
+    if len(args.files) < 2:
+        parser.error("비교하려면 결과 파일이 2개 이상 필요합니다.")
+
+    runs = [list(iter_results(path)) for path in args.files]
+    report = build_report(args.files, runs)
+
+    if not args.quiet:
+        print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4, ensure_ascii=False)
+    if args.csv:
+        write_csv(report, args.csv)
+
+
+if __name__ == "__main__":
+    main()
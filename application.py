@@ -1,12 +1,31 @@
 import streamlit as st
+import datetime
 import json
+import os
 import pandas as pd
 from streamlit_option_menu import option_menu
 from streamlit_lottie import st_lottie
-import requests
 import plotly.express as px
 import plotly.graph_objects as go
 
+from aggregates import (
+    build_aggregates,
+    build_overview_frame,
+    filter_overview,
+    sort_overview,
+)
+from assets import asset_path, start_background_download
+from clustering import UNASSIGNED, load_or_cluster
+from name_index import NameIndex
+from results_io import freeze, iter_results
+from similarity import load_or_build
+from term_stats import TermStats
+from text_search import SUMMARY_SCOPE, TextIndex, highlight
+
+RESULTS_PATH = "evaluation_results_enhanced_ver2.json"
+
+PAGE_SIZES = [10, 20, 50, 100]
+
 # 페이지 설정
 st.set_page_config(
     page_title="지원서 요약 확인",
@@ -65,43 +84,261 @@ st.markdown(
 )
 
 
-# 데이터 로드
-@st.cache_data
-def load_data():
-    with open("evaluation_results_enhanced_ver2.json", "r", encoding="utf-8") as f:
-        return json.load(f)
+# 데이터 로드 - 서버 프로세스에 한 번만 올리고 모든 세션이 같은 객체를 공유
+# (cache_data 는 호출마다 전체를 복사하므로 사용하지 않음, 결과 파일이 바뀌면 mtime 으로 다시 로드)
+@st.cache_resource(max_entries=1)
+def load_data(path, mtime):
+    return freeze(list(iter_results(path)))
 
 
-evaluation_results = load_data()
+# 데이터 버전 (파일 경로, 수정 시각) - 아래 캐시들의 키
+data_version = (RESULTS_PATH, os.path.getmtime(RESULTS_PATH))
+evaluation_results = load_data(*data_version)
 
 
-# Lottie 애니메이션 로드
-@st.cache_data
-def load_lottie_url(url):
-    r = requests.get(url)
-    if r.status_code != 200:
+# 통계와 차트는 데이터 버전마다 한 번만 계산 (올해가 바뀌면 나이 계산도 다시)
+@st.cache_resource(max_entries=1)
+def load_aggregates(path, mtime, year):
+    return build_aggregates(load_data(path, mtime))
+
+
+@st.cache_resource(max_entries=1)
+def gender_figure(path, mtime, year):
+    gender_counts = load_aggregates(path, mtime, year)["gender_counts"]
+    fig = px.pie(
+        values=list(gender_counts.values()),
+        names=list(gender_counts.keys()),
+        title="성별 분포",
+        color_discrete_sequence=px.colors.qualitative.Pastel,
+        hole=0.4,
+    )
+    fig.update_layout(margin=dict(t=30, b=0, l=0, r=0))
+    return fig
+
+
+@st.cache_resource(max_entries=1)
+def age_figure(path, mtime, year):
+    age_groups = load_aggregates(path, mtime, year)["age_groups"]
+    age_df = pd.DataFrame(
+        {"연령대": list(age_groups.keys()), "인원수": list(age_groups.values())}
+    )
+
+    # 색상 팔레트 개선
+    color_scale = px.colors.qualitative.Pastel1
+
+    fig = px.bar(
+        age_df,
+        x="연령대",
+        y="인원수",
+        text="인원수",
+        title="연령대별 지원자 분포",
+        color="연령대",
+        color_discrete_sequence=color_scale,
+    )
+
+    fig.update_layout(
+        showlegend=False,
+        xaxis_title="",
+        yaxis_title="지원자 수",
+        plot_bgcolor="rgba(0,0,0,0)",
+        yaxis=dict(gridcolor="rgba(0,0,0,0.1)"),
+    )
+
+    fig.update_traces(textposition="outside")
+    return fig
+
+
+@st.cache_resource(max_entries=1)
+def score_figure(path, mtime, year):
+    distributions = load_aggregates(path, mtime, year)["score_distributions"]
+    score_df = pd.DataFrame(
+        [
+            {"평가 항목": category, "점수": score, "인원수": count}
+            for category, scores in distributions.items()
+            for score, count in scores.items()
+        ]
+    )
+    fig = px.bar(
+        score_df,
+        x="평가 항목",
+        y="인원수",
+        color="점수",
+        text="인원수",
+        title="평가 항목별 점수 분포",
+        color_discrete_sequence=px.colors.qualitative.Pastel,
+    )
+    fig.update_layout(
+        xaxis_title="",
+        yaxis_title="지원자 수",
+        plot_bgcolor="rgba(0,0,0,0)",
+        yaxis=dict(gridcolor="rgba(0,0,0,0.1)"),
+    )
+    return fig
+
+
+@st.cache_resource(max_entries=1)
+def load_name_index(path, mtime):
+    return NameIndex(applicant["user_name"] for applicant in load_data(path, mtime))
+
+
+@st.cache_resource(max_entries=1)
+def load_term_stats(path, mtime):
+    return TermStats(load_data(path, mtime))
+
+
+@st.cache_resource(max_entries=1)
+def load_similarity_index(path, mtime):
+    # 디스크에 저장된 행렬이 있으면 불러오기만 함 (.cache/similarity)
+    return load_or_build(load_data(path, mtime), path, mtime)
+
+
+@st.cache_resource(max_entries=4)
+def load_clusters(path, mtime, k):
+    # 데이터 버전과 그룹 수가 같으면 .cache/clusters 에 저장된 결과를 다시 사용
+    return load_or_cluster(load_similarity_index(path, mtime), path, mtime, k)
+
+
+def cluster_name(clusters, cluster):
+    return f"{cluster + 1}. " + " · ".join(clusters["terms"][cluster][:3])
+
+
+@st.cache_resource(max_entries=4)
+def cluster_size_figure(path, mtime, k):
+    clusters = load_clusters(path, mtime, k)
+    sizes = pd.DataFrame(
+        {
+            "그룹": [
+                cluster_name(clusters, cluster)
+                for cluster in range(len(clusters["sizes"]))
+            ],
+            "인원": clusters["sizes"],
+        }
+    )
+    fig = px.bar(
+        sizes,
+        x="인원",
+        y="그룹",
+        orientation="h",
+        title="그룹별 지원자 수",
+        color="인원",
+        color_continuous_scale=px.colors.sequential.Blues,
+    )
+    fig.update_layout(
+        yaxis={"categoryorder": "array", "categoryarray": sizes["그룹"][::-1]},
+        yaxis_title="",
+        coloraxis_showscale=False,
+    )
+    return fig
+
+
+@st.cache_resource(max_entries=16)
+def cluster_score_figure(path, mtime, year, k, category):
+    # 그룹마다 점수 비율 (100% 누적 막대)
+    clusters = load_clusters(path, mtime, k)
+    frame = load_overview_frame(path, mtime, year)
+    labels = pd.Series(clusters["labels"], index=frame.index)
+    assigned = labels >= 0
+    table = pd.crosstab(
+        labels[assigned].map(lambda cluster: cluster_name(clusters, cluster)),
+        frame.loc[assigned, category],
+        normalize="index",
+        dropna=False,
+    ).rename_axis(index="그룹", columns="점수")
+    shares = table.stack().rename("비율").reset_index()
+    fig = px.bar(
+        shares,
+        x="비율",
+        y="그룹",
+        color="점수",
+        orientation="h",
+        title=f"그룹별 '{category}' 점수 분포",
+        category_orders={"점수": list(frame[category].cat.categories)},
+    )
+    fig.update_layout(
+        barmode="stack",
+        xaxis_tickformat=".0%",
+        xaxis_title="",
+        yaxis_title="",
+        yaxis={"categoryorder": "category descending"},
+    )
+    return fig
+
+
+@st.cache_resource(max_entries=8)
+def keyword_figure(path, mtime, problem):
+    keywords = pd.DataFrame(
+        load_term_stats(path, mtime).cohort_keywords(problem),
+        columns=["단어", "비율"],
+    )
+    fig = px.bar(
+        keywords,
+        x="단어",
+        y="비율",
+        title=f"{problem} 전체 지원자 키워드",
+        color="비율",
+        color_continuous_scale=px.colors.sequential.Blues,
+    )
+    fig.update_layout(
+        xaxis_title="",
+        yaxis_title="언급한 지원자 비율",
+        yaxis_tickformat=".0%",
+        coloraxis_showscale=False,
+    )
+    return fig
+
+
+@st.cache_resource
+def load_text_index(path):
+    # 파일 경로마다 하나 - 데이터 버전이 바뀌면 sync 로 새로 추가되거나 내용이 바뀐 지원자 반영
+    return TextIndex()
+
+
+@st.cache_resource(max_entries=1)
+def load_overview_frame(path, mtime, year):
+    return build_overview_frame(load_data(path, mtime))
+
+
+current_year = datetime.datetime.now().year
+aggregates = load_aggregates(*data_version, current_year)
+
+
+# 이미지/애니메이션 - 저장소의 원본 -> 디스크 캐시 -> 저장소의 대체 파일 (화면을 그릴 때는 네트워크 사용 안 함)
+# 원본은 python assets.py 로 받아서 assets/ 에 커밋, ASSET_DOWNLOAD=1 이면 원본이 없을 때
+# 프로세스마다 한 번 백그라운드에서 받아 두고 다음 실행부터 사용
+@st.cache_resource
+def start_asset_download():
+    return start_background_download()
+
+
+@st.cache_resource
+def load_lottie(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
         return None
-    return r.json()
 
 
-lottie_search = load_lottie_url(
-    "https://assets5.lottiefiles.com/packages/lf20_5njp3vgg.json"
-)
-lottie_document = load_lottie_url(
-    "https://assets1.lottiefiles.com/packages/lf20_qp1q7mct.json"
-)
+def show_lottie(name, height, key):
+    path = asset_path(name)
+    animation = load_lottie(path) if path else None
+    if animation is not None:
+        st_lottie(animation, height=height, key=key)
+
+
+start_asset_download()
 
 # 사이드바 메뉴
 with st.sidebar:
-    st.image(
-        "https://www.yonsei.ac.kr/_res/yonsei/img/intro/img_symbol01.png", width=100
-    )
+    logo = asset_path("yonsei_symbol.png")
+    if logo:
+        st.image(logo, width=100)
     st.title("연세대학교 BIT")
 
     selected = option_menu(
         menu_title="메뉴",
-        options=["홈", "전체 지원자 보기", "지원자 검색"],
-        icons=["house", "list-ul", "search"],
+        options=["홈", "전체 지원자 보기", "지원자 검색", "내용 검색", "주제별 그룹"],
+        icons=["house", "list-ul", "search", "file-earmark-text", "diagram-3"],
         menu_icon="cast",
         default_index=0,
     )
@@ -109,25 +346,14 @@ with st.sidebar:
     st.divider()
     st.subheader("📊 통계")
 
-    # 간단한 통계 계산
-    total_applicants = len(evaluation_results)
-
-    # 성별 통계
-    gender_counts = {"남": 0, "여": 0}
-    for applicant in evaluation_results:
-        gender = applicant["user_sex"]
-        gender_counts[gender] = gender_counts.get(gender, 0) + 1
+    # 미리 계산된 통계 사용
+    total_applicants = aggregates["total"]
+    gender_counts = aggregates["gender_counts"]
 
     # 통계 시각화
-    fig = px.pie(
-        values=list(gender_counts.values()),
-        names=list(gender_counts.keys()),
-        title="성별 분포",
-        color_discrete_sequence=px.colors.qualitative.Pastel,
-        hole=0.4,
+    st.plotly_chart(
+        gender_figure(*data_version, current_year), use_container_width=True
     )
-    fig.update_layout(margin=dict(t=30, b=0, l=0, r=0))
-    st.plotly_chart(fig, use_container_width=True)
 
     # 지원자 수 표시
     st.metric("총 지원자 수", f"{total_applicants}명")
@@ -207,66 +433,17 @@ if selected == "홈":
 
         # 연령대 통계 (생년월일 기반)
         with col_stat2:
-            # 생년월일 기반 나이 계산
-            import datetime
-
-            current_year = datetime.datetime.now().year
-
-            age_groups = {
-                "20대 초반": 0,
-                "20대 중반": 0,
-                "20대 후반": 0,
-                "30대 이상": 0,
-            }
-
-            for applicant in evaluation_results:
-                try:
-                    birth_year = int(applicant["user_birth"].split("-")[0])
-                    age = current_year - birth_year
-
-                    if age < 23:
-                        age_groups["20대 초반"] += 1
-                    elif age < 27:
-                        age_groups["20대 중반"] += 1
-                    elif age < 30:
-                        age_groups["20대 후반"] += 1
-                    else:
-                        age_groups["30대 이상"] += 1
-                except:
-                    pass
-
-            # 연령 분포 시각화 - 개선된 디자인
-            age_df = pd.DataFrame(
-                {"연령대": list(age_groups.keys()), "인원수": list(age_groups.values())}
-            )
-
-            # 색상 팔레트 개선
-            color_scale = px.colors.qualitative.Pastel1
-
-            fig = px.bar(
-                age_df,
-                x="연령대",
-                y="인원수",
-                text="인원수",
-                title="연령대별 지원자 분포",
-                color="연령대",
-                color_discrete_sequence=color_scale,
+            st.plotly_chart(
+                age_figure(*data_version, current_year), use_container_width=True
             )
 
-            fig.update_layout(
-                showlegend=False,
-                xaxis_title="",
-                yaxis_title="지원자 수",
-                plot_bgcolor="rgba(0,0,0,0)",
-                yaxis=dict(gridcolor="rgba(0,0,0,0.1)"),
+        if aggregates["score_distributions"]:
+            st.plotly_chart(
+                score_figure(*data_version, current_year), use_container_width=True
             )
 
-            fig.update_traces(textposition="outside")
-
-            st.plotly_chart(fig, use_container_width=True)
-
     with col2:
-        st_lottie(lottie_document, height=300, key="document")
+        show_lottie("lottie_document.json", height=300, key="document")
 
         # 빠른 검색 기능 - 카드 디자인 적용
         st.markdown(
@@ -285,6 +462,7 @@ if selected == "홈":
 # 전체 지원자 보기
 elif selected == "전체 지원자 보기":
     st.title("전체 지원자 정보")
+    overview_frame = load_overview_frame(*data_version, current_year)
 
     # 필터링 옵션
     col_filter1, col_filter2 = st.columns([1, 3])
@@ -295,34 +473,31 @@ elif selected == "전체 지원자 보기":
     with col_filter2:
         name_filter = st.text_input("이름 검색", placeholder="이름으로 검색...")
 
-    # 데이터프레임 생성을 위한 데이터 준비
-    applicant_data = []
-    filtered_applicants = []
-
-    for applicant in evaluation_results:
-        name = applicant["user_name"]
-        sex = applicant["user_sex"]
-        birth = applicant["user_birth"]
-
-        # 필터링 적용
-        if (gender_filter == "전체" or sex == gender_filter) and (
-            not name_filter or name_filter.lower() in name.lower()
-        ):
-
-            # 문항 개수 확인
-            problem_count = len(applicant["summarization"])
-
-            applicant_data.append(
-                {"이름": name, "성별": sex, "생년월일": birth, "문항 수": problem_count}
-            )
+    # 점수 필터
+    score_filters = {}
+    score_columns = overview_frame.attrs["score_columns"]
+    if score_columns:
+        with st.expander("점수 필터"):
+            score_cols = st.columns(len(score_columns))
+            for col, category in zip(score_cols, score_columns):
+                with col:
+                    score_filters[category] = st.multiselect(
+                        category, list(overview_frame[category].cat.categories)
+                    )
 
-            filtered_applicants.append(applicant)
+    # 캐시된 표에서 마스크로 필터링
+    filtered = filter_overview(
+        overview_frame,
+        sex=None if gender_filter == "전체" else gender_filter,
+        name=name_filter,
+        scores=score_filters,
+    )
 
     # 검색 결과 메시지
-    if name_filter or gender_filter != "전체":
-        st.info(f"검색 결과: {len(filtered_applicants)}명의 지원자를 찾았습니다.")
+    if name_filter or gender_filter != "전체" or any(score_filters.values()):
+        st.info(f"검색 결과: {len(filtered)}명의 지원자를 찾았습니다.")
 
-    df = pd.DataFrame(applicant_data)
+    df = filtered[["이름", "성별", "생년월일", "문항 수"]]
 
     # 데이터프레임 표시 - 깔끔한 형태로
     st.dataframe(
@@ -349,21 +524,46 @@ elif selected == "전체 지원자 보기":
     with col_sort2:
         sort_order = st.radio("정렬 순서", ["오름차순", "내림차순"], horizontal=True)
 
-    # 정렬 적용
-    if sort_option == "이름":
-        filtered_applicants.sort(
-            key=lambda x: x["user_name"], reverse=(sort_order == "내림차순")
+    # 정렬 적용 - 미리 계산된 정렬 키 사용
+    filtered = sort_overview(
+        filtered,
+        "name_key" if sort_option == "이름" else "birth_key",
+        descending=(sort_order == "내림차순"),
+    )
+
+    # 페이지 나누기 - 현재 페이지의 지원자만 화면에 만듦
+    col_page1, col_page2 = st.columns([1, 3])
+    with col_page1:
+        page_size = st.selectbox("페이지당 지원자 수", PAGE_SIZES, index=1)
+    page_count = max(1, -(-len(filtered) // page_size))
+    with col_page2:
+        # 필터가 바뀌어 페이지 수가 달라지면 1페이지부터 다시 시작
+        page = st.number_input(
+            f"페이지 (전체 {page_count}쪽)",
+            min_value=1,
+            max_value=page_count,
+            value=1,
+            step=1,
         )
-    else:
-        filtered_applicants.sort(
-            key=lambda x: x["user_birth"], reverse=(sort_order == "내림차순")
+    start = (page - 1) * page_size
+    page_index = filtered.index[start : start + page_size]
+    st.caption(
+        f"{len(filtered)}명 중 {start + 1 if len(page_index) else 0}~{start + len(page_index)}번째"
+    )
+
+    # 상세 정보는 펼친 지원자만 만듦 (접힌 expander 도 내용을 매번 만들기 때문에 토글 사용)
+    # 위젯 키는 데이터 안의 위치 기준 (정렬이나 페이지가 바뀌어도 펼침 상태 유지)
+    for key in page_index:
+        applicant = evaluation_results[key]
+
+        opened = st.toggle(
+            f"📄 {applicant['user_name']} ({applicant['user_sex']}, {applicant['user_birth']})",
+            key=f"detail_{key}",
         )
+        if not opened:
+            continue
 
-    # Expander로 각 지원자 정보 표시
-    for i, applicant in enumerate(filtered_applicants):
-        with st.expander(
-            f"📄 {applicant['user_name']} ({applicant['user_sex']}, {applicant['user_birth']})"
-        ):
+        with st.container(border=True):
             col1, col2 = st.columns([1, 2])
 
             with col1:
@@ -385,30 +585,35 @@ elif selected == "전체 지원자 보기":
                     st.write(f"**연락처:** {applicant['user_phone']}")
 
             with col2:
-                # 요약 정보 탭으로 구성
+                # 선택한 문항의 요약만 표시 (탭은 모든 문항을 한 번에 만듦)
                 if len(applicant["summarization"]) > 0:
-                    sum_tabs = st.tabs(
-                        [f"문항 {i+1}" for i in range(len(applicant["summarization"]))]
+                    problems = list(applicant["summarization"].items())
+                    i = st.radio(
+                        "문항",
+                        range(len(problems)),
+                        format_func=lambda i: f"문항 {i+1}",
+                        horizontal=True,
+                        label_visibility="collapsed",
+                        key=f"problem_{key}",
+                    )
+                    problem, summary = problems[i]
+                    st.markdown(
+                        f'<div class="summary-header">{problem}</div>',
+                        unsafe_allow_html=True,
+                    )
+                    st.markdown(
+                        f'<div class="info-highlight">{summary}</div>',
+                        unsafe_allow_html=True,
                     )
-
-                    for i, (problem, summary) in enumerate(
-                        applicant["summarization"].items()
-                    ):
-                        with sum_tabs[i]:
-                            st.markdown(
-                                f'<div class="summary-header">{problem}</div>',
-                                unsafe_allow_html=True,
-                            )
-                            st.markdown(
-                                f'<div class="info-highlight">{summary}</div>',
-                                unsafe_allow_html=True,
-                            )
                 else:
                     st.info("요약된 지원서 정보가 없습니다.")
 
 # 지원자 검색
 elif selected == "지원자 검색":
     st.title("지원자 검색")
+    name_index = load_name_index(*data_version)
+    term_stats = load_term_stats(*data_version)
+    similarity_index = load_similarity_index(*data_version)
 
     col1, col2 = st.columns([2, 1])
 
@@ -422,19 +627,24 @@ elif selected == "지원자 검색":
             search_default = st.session_state.search_name
             # 사용 후 세션에서 제거
             del st.session_state.search_name
+        # 비슷한 지원자를 눌렀을 때 열 지원자 (동명이인이 있어도 그 사람)
+        requested_position = st.session_state.pop("selected_position", None)
 
         search_name = st.text_input(
             "지원자 이름", value=search_default, placeholder="예: 홍길동"
         )
 
         if search_name:
-            found = False
-            matched_applicants = []
-
-            for applicant in evaluation_results:
-                if search_name in applicant["user_name"]:
-                    found = True
-                    matched_applicants.append(applicant)
+            # 이름 색인으로 검색 (앞부분/중간 일치, 초성, 오타 허용)
+            # 결과 수를 그대로 보여 주므로 자르지 않음
+            matches, match_mode = name_index.search(search_name, limit=None)
+            matched_applicants = [evaluation_results[i] for i in matches]
+            found = bool(matched_applicants)
+
+            if found and match_mode == "fuzzy":
+                st.warning(
+                    f"'{search_name}' 와 일치하는 이름이 없어 비슷한 이름을 보여줍니다."
+                )
 
             if found:
                 st.success(
@@ -443,26 +653,20 @@ elif selected == "지원자 검색":
 
                 if len(matched_applicants) > 1:
                     # 여러 지원자가 검색된 경우, 선택할 수 있게 함
-                    selected_name = st.selectbox(
+                    # 선택지는 결과 안의 위치 - 이름과 생년월일이 같아도 구분됨
+                    if requested_position in matches:
+                        st.session_state.applicant_choice = requested_position
+                    selected_position = st.selectbox(
                         "확인할 지원자를 선택하세요",
-                        [
-                            f"{a['user_name']} ({a['user_birth']})"
-                            for a in matched_applicants
-                        ],
+                        matches,
+                        format_func=lambda i: f"{evaluation_results[i]['user_name']} ({evaluation_results[i]['user_birth']})",
+                        key="applicant_choice",
                     )
-
-                    # 선택된 지원자 정보 가져오기
-                    selected_applicant = None
-                    for applicant in matched_applicants:
-                        if (
-                            f"{applicant['user_name']} ({applicant['user_birth']})"
-                            == selected_name
-                        ):
-                            selected_applicant = applicant
-                            break
+                    selected_applicant = evaluation_results[selected_position]
                 else:
                     # 한 명의 지원자만 검색된 경우
                     selected_applicant = matched_applicants[0]
+                    selected_position = matches[0]
 
                 # 선택된 지원자 정보 표시
                 if selected_applicant:
@@ -508,39 +712,15 @@ elif selected == "지원자 검색":
                                 unsafe_allow_html=True,
                             )
 
-                            # 워드 클라우드 또는 텍스트 분석 추가 (선택적)
+                            # 미리 계산된 단어 통계 - 전체 지원서 기준 TF-IDF 로 이 답변에서 두드러지는 단어
                             if st.checkbox("텍스트 분석 보기", key=f"analysis_{i}"):
-                                # 간단한 텍스트 분석 - 단어 빈도
-                                from collections import Counter
-                                import re
-
-                                # 불용어 정의
-                                stopwords = [
-                                    "있는",
-                                    "하는",
-                                    "그리고",
-                                    "그런",
-                                    "이런",
-                                    "저는",
-                                    "이것",
-                                    "정도",
-                                ]
-
-                                # 텍스트 전처리 및 단어 추출
-                                words = re.findall(r"\w+", summary)
-                                words = [
-                                    w
-                                    for w in words
-                                    if len(w) > 1 and w not in stopwords
-                                ]
-
-                                # 단어 빈도 계산
-                                word_counts = Counter(words).most_common(10)
-
-                                # 단어 빈도 시각화
-                                if word_counts:
+                                distinctive = term_stats.distinctive(
+                                    selected_position, problem
+                                )
+
+                                if distinctive:
                                     word_df = pd.DataFrame(
-                                        word_counts, columns=["단어", "빈도"]
+                                        distinctive, columns=["단어", "빈도", "TF-IDF"]
                                     )
 
                                     col_a, col_b = st.columns([3, 2])
@@ -549,14 +729,14 @@ elif selected == "지원자 검색":
                                         fig = px.bar(
                                             word_df,
                                             x="단어",
-                                            y="빈도",
-                                            title="주요 단어 빈도",
-                                            color="빈도",
+                                            y="TF-IDF",
+                                            title="특징적인 단어",
+                                            color="TF-IDF",
                                             color_continuous_scale=px.colors.sequential.Blues,
                                         )
                                         fig.update_layout(
                                             xaxis_title="",
-                                            yaxis_title="단어 빈도",
+                                            yaxis_title="TF-IDF",
                                             coloraxis_showscale=False,
                                         )
                                         st.plotly_chart(fig, use_container_width=True)
@@ -571,26 +751,53 @@ elif selected == "지원자 검색":
                                                 "단어": st.column_config.TextColumn(
                                                     "주요 단어"
                                                 ),
-                                                "빈도": st.column_config.ProgressColumn(
-                                                    "빈도",
+                                                "빈도": st.column_config.NumberColumn(
+                                                    "빈도", format="%d"
+                                                ),
+                                                "TF-IDF": st.column_config.ProgressColumn(
+                                                    "TF-IDF",
                                                     min_value=0,
-                                                    max_value=(
-                                                        max([c[1] for c in word_counts])
-                                                        if word_counts
-                                                        else 10
+                                                    max_value=float(
+                                                        word_df["TF-IDF"].max()
                                                     ),
-                                                    format="%d",
+                                                    format="%.2f",
                                                 ),
                                             },
                                         )
                                 else:
                                     st.info("분석할 단어가 충분하지 않습니다.")
 
+                                # 같은 문항에 대한 전체 지원자의 주요 키워드
+                                st.plotly_chart(
+                                    keyword_figure(*data_version, problem),
+                                    use_container_width=True,
+                                )
+
+                    # 요약 내용이 가장 비슷한 지원자 (평가 기준 맞추기용)
+                    st.markdown("### 비슷한 지원자")
+                    similar = similarity_index.similar(selected_position, k=5)
+                    if similar:
+                        for position, score in similar:
+                            other = evaluation_results[position]
+                            col_name, col_score = st.columns([3, 1])
+                            with col_name:
+                                if st.button(
+                                    f"{other['user_name']} ({other['user_birth']})",
+                                    key=f"similar_{position}",
+                                ):
+                                    st.session_state.search_name = other["user_name"]
+                                    st.session_state.selected_position = position
+                                    st.rerun()
+                            with col_score:
+                                st.progress(score, text=f"유사도 {score:.0%}")
+                    else:
+                        st.info("비교할 수 있는 지원자가 없습니다.")
+
             else:
                 st.error(f"'{search_name}' 이름의 지원자를 찾을 수 없습니다.")
 
     with col2:
-        st_lottie(lottie_search, height=200, key="search")
+        show_lottie("lottie_search.json", height=200, key="search")
 
         # 검색 팁과 함께 카드 디자인 적용
         st.markdown(
@@ -598,9 +805,10 @@ elif selected == "지원자 검색":
         <div class="applicant-card">
             <h4>검색 팁</h4>
             <ul>
-                <li>정확한 이름을 입력하세요</li>
                 <li>성과 이름 사이에 공백 없이 입력하세요</li>
                 <li>부분 이름으로도 검색이 가능합니다</li>
+                <li>초성으로도 검색할 수 있습니다 (예: ㄱㅁㅅ)</li>
+                <li>한 글자 정도 틀려도 비슷한 이름을 찾아줍니다</li>
             </ul>
         </div>
         """,
@@ -622,5 +830,99 @@ elif selected == "지원자 검색":
             # 최근 검색어 버튼 스타일링
             for recent in st.session_state.recent_searches:
                 if st.button(recent, key=f"recent_{recent}"):
-                    st.session_state.search_name = recent   
+                    st.session_state.search_name = recent
                     st.rerun()
+
+# 요약/평가 근거 내용 검색
+elif selected == "내용 검색":
+    st.title("내용 검색")
+    text_index = load_text_index(RESULTS_PATH)
+    text_index.sync(evaluation_results, data_version)
+
+    st.info("지원서 요약과 평가 근거에서 단어나 문장으로 지원자를 찾습니다.")
+
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        text_query = st.text_input("검색어", placeholder="예: 데이터 분석, 공모전")
+    with col2:
+        scope = st.selectbox(
+            "검색 범위",
+            ["전체", SUMMARY_SCOPE] + list(aggregates["score_distributions"]),
+        )
+
+    if text_query:
+        # BM25 점수 순 - 지원자마다 가장 잘 맞는 항목 하나만 표시
+        hits, total = text_index.search(
+            text_query, scope=None if scope == "전체" else scope, limit=30
+        )
+        if hits:
+            shown = f" (점수 높은 {len(hits)}명 표시)" if total > len(hits) else ""
+            st.success(f"'{text_query}' 검색 결과: {total}명의 지원자{shown}")
+            for position, score, label, text in hits:
+                applicant = evaluation_results[position]
+                st.markdown(
+                    f"""
+                <div class="applicant-card">
+                    <h4>{applicant['user_name']}
+                        <span class="tag">{applicant['user_birth']}</span>
+                        <span class="tag">{label}</span>
+                        <span class="tag">{score:.2f}</span>
+                    </h4>
+                    <p>{highlight(text, text_query, width=160)}</p>
+                </div>
+                """,
+                    unsafe_allow_html=True,
+                )
+        else:
+            st.error(f"'{text_query}' 이(가) 포함된 내용을 찾을 수 없습니다.")
+
+# 요약 내용으로 묶은 주제별 그룹
+elif selected == "주제별 그룹":
+    st.title("주제별 그룹")
+    st.info("지원서 요약에 나온 단어가 비슷한 지원자끼리 묶었습니다.")
+
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        k = st.slider("그룹 수", min_value=2, max_value=10, value=6)
+    clusters = load_clusters(*data_version, k)
+    score_columns = load_overview_frame(*data_version, current_year).attrs[
+        "score_columns"
+    ]
+    with col2:
+        category = st.selectbox("점수 분포를 볼 평가 항목", score_columns)
+
+    col_a, col_b = st.columns(2)
+    with col_a:
+        st.plotly_chart(cluster_size_figure(*data_version, k), use_container_width=True)
+    with col_b:
+        if category:
+            st.plotly_chart(
+                cluster_score_figure(*data_version, current_year, k, category),
+                use_container_width=True,
+            )
+
+    unassigned = clusters["labels"].count(UNASSIGNED)
+    if unassigned:
+        st.caption(f"요약에 공통 단어가 없어 묶이지 않은 지원자 {unassigned}명")
+
+    for cluster, size in enumerate(clusters["sizes"]):
+        with st.expander(f"{cluster_name(clusters, cluster)} ({size}명)"):
+            st.markdown(
+                " ".join(
+                    f'<span class="tag">{term}</span>'
+                    for term in clusters["terms"][cluster]
+                ),
+                unsafe_allow_html=True,
+            )
+            members = [
+                position
+                for position, label in enumerate(clusters["labels"])
+                if label == cluster
+            ]
+            st.write(
+                ", ".join(
+                    evaluation_results[position]["user_name"]
+                    for position in members[:30]
+                )
+                + (f" 외 {len(members) - 30}명" if len(members) > 30 else "")
+            )
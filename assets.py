@@ -0,0 +1,130 @@
+import argparse
+import os
+import threading
+import time
+
+import requests
+
+from cache import CACHE_DIR
+
+# 저장소에 함께 두는 파일 - 원본(python assets.py 로 받아서 커밋)이 없으면 fallback 의 대체 파일 사용
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
+FALLBACK_DIR = os.path.join(ASSETS_DIR, "fallback")
+DOWNLOAD_DIR = os.path.join(CACHE_DIR, "assets")
+
+TIMEOUT = float(os.getenv("ASSET_TIMEOUT", "3"))
+# 대시보드가 원본을 백그라운드에서 받는 것은 ASSET_DOWNLOAD=1 일 때만 (기본은 외부 요청 없음)
+DOWNLOAD_ENABLED = os.getenv("ASSET_DOWNLOAD") == "1"
+# 받기에 실패하면 이 시간(초) 동안은 다른 프로세스도 다시 시도하지 않음
+RETRY_SECONDS = float(os.getenv("ASSET_RETRY_SECONDS", str(24 * 60 * 60)))
+
+# 이름: (원본 주소, fallback 폴더의 대체 파일)
+ASSETS = {
+    "lottie_search.json": (
+        "https://assets5.lottiefiles.com/packages/lf20_5njp3vgg.json",
+        "lottie_search.json",
+    ),
+    "lottie_document.json": (
+        "https://assets1.lottiefiles.com/packages/lf20_qp1q7mct.json",
+        "lottie_document.json",
+    ),
+    "yonsei_symbol.png": (
+        "https://www.yonsei.ac.kr/_res/yonsei/img/intro/img_symbol01.png",
+        "yonsei_symbol.svg",
+    ),
+}
+
+
+def downloaded(name):
+    # 저장소에 원본이 있거나 이미 디스크 캐시에 받아 둔 경우
+    return any(
+        os.path.exists(os.path.join(directory, name))
+        for directory in [ASSETS_DIR, DOWNLOAD_DIR]
+    )
+
+
+def asset_path(name):
+    # 저장소의 원본 -> 디스크 캐시 -> 저장소의 대체 파일 순서 (네트워크는 사용하지 않음)
+    candidates = [
+        os.path.join(ASSETS_DIR, name),
+        os.path.join(DOWNLOAD_DIR, name),
+        os.path.join(FALLBACK_DIR, ASSETS[name][1]),
+    ]
+    for path in candidates:
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def fetch(name, directory, timeout=TIMEOUT):
+    # 받아서 directory 에 저장, 네트워크가 없거나 느리면 timeout 후 None
+    try:
+        response = requests.get(ASSETS[name][0], timeout=timeout)
+        response.raise_for_status()
+    except requests.RequestException:
+        return None
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, name)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(response.content)
+    os.replace(tmp, path)
+    return path
+
+
+def failure_marker(name):
+    return os.path.join(DOWNLOAD_DIR, f"{name}.failed")
+
+
+def recently_failed(name):
+    try:
+        return time.time() - os.path.getmtime(failure_marker(name)) < RETRY_SECONDS
+    except OSError:
+        return False
+
+
+def download_missing(timeout=TIMEOUT):
+    # 원본이 없는 파일만 받아서 디스크 캐시에 저장, 실패하면 표시 파일을 남김
+    for name in ASSETS:
+        if downloaded(name) or recently_failed(name):
+            continue
+        if fetch(name, DOWNLOAD_DIR, timeout) is None:
+            os.makedirs(DOWNLOAD_DIR, exist_ok=True)
+            with open(failure_marker(name), "w") as f:
+                f.write(ASSETS[name][0])
+
+
+def start_background_download():
+    # 대시보드 시작은 기다리지 않음 - 받는 동안에는 대체 파일을 보여주고 다음 실행부터 원본 사용
+    # ASSET_DOWNLOAD=1 이 아니면 아무 것도 하지 않음 (제한된 네트워크에서도 외부 요청 없이 시작)
+    if not DOWNLOAD_ENABLED:
+        return None
+    thread = threading.Thread(target=download_missing, daemon=True)
+    thread.start()
+    return thread
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대시보드 이미지/애니메이션 파일 받기")
+    parser.add_argument(
+        "--directory",
+        default=ASSETS_DIR,
+        help="저장할 폴더 (기본: 저장소의 assets, 커밋해서 함께 배포)",
+    )
+    parser.add_argument("--timeout", type=float, default=30)
+    args = parser.parse_args()
+
+    failed = 0
+    for name in ASSETS:
+        path = fetch(name, args.directory, args.timeout)
+        if path:
+            print(f"{name}: {path}")
+        else:
+            failed += 1
+            print(f"{name}: 받지 못했습니다 ({ASSETS[name][0]})")
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
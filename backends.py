@@ -0,0 +1,337 @@
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from dotenv import load_dotenv
+
+from monitor import TARGET_QUOTAS
+
+load_dotenv()
+
+BACKENDS = ["openai", "local", "mock"]
+
+
+@dataclass
+class Completion:
+    content: str
+    model: str = ""
+    # prompt_tokens, completion_tokens, cached_tokens
+    usage: dict = field(default_factory=dict)
+    headers: dict = field(default_factory=dict)
+    # 성공하기까지의 재시도 횟수와 그중 429 응답 횟수
+    retries: int = 0
+    throttled: int = 0
+
+
+class LLMBackend:
+    name = "base"
+    model = ""
+    # 동시에 보낼 수 있는 요청 수
+    max_concurrency = 1
+    # 여러 요청을 한 번에 처리할 수 있는지 (아니면 complete_batch 가 동시 요청으로 대신함)
+    supports_batching = False
+
+    def complete(self, messages, json_mode=True):
+        raise NotImplementedError
+
+    def complete_batch(self, requests, json_mode=True):
+        # requests: [messages, ...] -> [Completion, ...] (순서 유지)
+        workers = max(1, min(len(requests), self.max_concurrency))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(lambda m: self.complete(m, json_mode), requests))
+
+    def describe(self):
+        batching = "배치 지원" if self.supports_batching else "배치 미지원"
+        return (
+            f"{self.name} ({self.model}, 동시 요청 {self.max_concurrency}, {batching})"
+        )
+
+
+def retry_delay(error, attempt):
+    # 서버가 알려준 대기 시간(retry-after-ms, retry-after)이 있으면 따르고, 없으면 지수 백오프
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        if "retry-after-ms" in headers:
+            return float(headers["retry-after-ms"]) / 1000
+        if "retry-after" in headers:
+            return float(headers["retry-after"])
+    except ValueError:
+        pass
+    return min(30.0, 0.5 * 2**attempt) * random.uniform(0.5, 1.0)
+
+
+class OpenAIBackend(LLMBackend):
+    name = "openai"
+
+    def __init__(
+        self,
+        model="gpt-4o",
+        api_key=None,
+        base_url=None,
+        max_concurrency=16,
+        max_retries=4,
+    ):
+        self.model = model
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+        self.base_url = base_url
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self._client = None
+        self._client_lock = threading.Lock()
+
+    @property
+    def client(self):
+        # 실제로 요청할 때 처음 생성 (mock 등 다른 백엔드만 쓸 때는 키가 없어도 됨)
+        with self._client_lock:
+            if self._client is None:
+                from openai import OpenAI
+
+                # 재시도는 complete() 에서 직접 처리해서 횟수를 기록
+                self._client = OpenAI(
+                    api_key=self.api_key, base_url=self.base_url, max_retries=0
+                )
+        return self._client
+
+    def complete(self, messages, json_mode=True):
+        from openai import APIConnectionError, InternalServerError, RateLimitError
+
+        kwargs = {"model": self.model, "messages": messages}
+        if json_mode:
+            kwargs["response_format"] = {"type": "json_object"}
+
+        retries = 0
+        throttled = 0
+        while True:
+            try:
+                raw = self.client.chat.completions.with_raw_response.create(**kwargs)
+                break
+            except (RateLimitError, APIConnectionError, InternalServerError) as e:
+                if isinstance(e, RateLimitError):
+                    throttled += 1
+                if retries >= self.max_retries:
+                    e.retries = retries
+                    e.throttled = throttled
+                    raise
+                time.sleep(retry_delay(e, retries))
+                retries += 1
+        response = raw.parse()
+
+        usage = {}
+        if response.usage is not None:
+            details = response.usage.prompt_tokens_details
+            usage = {
+                "prompt_tokens": response.usage.prompt_tokens,
+                "completion_tokens": response.usage.completion_tokens,
+                "cached_tokens": (details.cached_tokens or 0) if details else 0,
+            }
+        return Completion(
+            content=response.choices[0].message.content,
+            model=response.model,
+            usage=usage,
+            headers=dict(raw.headers),
+            retries=retries,
+            throttled=throttled,
+        )
+
+
+class LocalOpenAIBackend(OpenAIBackend):
+    # llama.cpp server 등 OpenAI 호환 API 를 제공하는 로컬 서버
+    name = "local"
+
+    def __init__(
+        self,
+        model="local",
+        base_url="http://localhost:8080/v1",
+        max_concurrency=4,
+    ):
+        # 로컬 서버는 키를 검사하지 않지만 클라이언트 생성에 값이 필요함
+        super().__init__(
+            model=model,
+            api_key="not-needed",
+            base_url=base_url,
+            max_concurrency=max_concurrency,
+        )
+
+
+def estimate_tokens(text):
+    return max(1, len(text) // 2)
+
+
+def parse_user_info(text):
+    info = {}
+    for key, label in [
+        ("user_name", "성명"),
+        ("user_sex", "성별"),
+        ("user_birth", "생년월일"),
+    ]:
+        match = re.search(rf"{label}\s*[:：]?\s*(\S+)", text)
+        info[key] = match.group(1) if match else ""
+    return info
+
+
+def draw(rng, quotas):
+    scores = list(quotas)
+    return rng.choices(scores, weights=[quotas[s] for s in scores])[0]
+
+
+def mock_response(messages, rng):
+    # 시스템 프롬프트에 제시된 응답 형식에 맞춰 결정적인 가짜 응답 생성
+    system = messages[0]["content"]
+    user = messages[-1]["content"]
+
+    if '"evaluation_result"' in system:
+        info_match = re.search(r"<지원자_정보>(.*?)</지원자_정보>", user, re.S)
+        form_match = re.search(r"<지원서_내용>(.*?)</지원서_내용>", user, re.S)
+        result = parse_user_info(info_match.group(1) if info_match else "")
+        questions = re.split(
+            r"(?m)^(?=\s*\d+\)\s)", form_match.group(1) if form_match else ""
+        )
+        questions = [q.strip() for q in questions if q.strip()]
+        result["summarization"] = {
+            f"problem_{i + 1}": " ".join(q.split())[:200]
+            for i, q in enumerate(questions)
+        }
+        result["evaluation_result"] = {
+            "지원 동기 및 진정성": {
+                "score": draw(rng, TARGET_QUOTAS["지원 동기 및 진정성"]),
+                "goal_alignment_explanation": "mock",
+            },
+            "논리적 표현력": {
+                "score": draw(rng, TARGET_QUOTAS["논리적 표현력"]),
+                "logical_expression_explanation": "mock",
+            },
+            "활동경험": {
+                "score": draw(rng, TARGET_QUOTAS["활동경험"]),
+                "activity_experience_explanation": "mock",
+            },
+            "성실성(성의)": {
+                "score": draw(rng, {"P": 0.9, "NP": 0.1}),
+                "diligence_explanation": "mock",
+            },
+        }
+        return result
+
+    if '"question"' in system:
+        lines = user.strip().splitlines()
+        return {
+            "question": lines[0] if lines else "",
+            "summary": " ".join(user.split())[:300],
+        }
+
+    if "motivations" in system:
+        names = re.findall(r"^\[(.+?)\]$", user, re.M)
+        return {
+            section: [
+                {"theme": f"mock {section}", "count": len(names), "examples": names[:5]}
+            ]
+            for section in ["motivations", "goal_themes", "standout_experiences"]
+        }
+
+    return {"content": " ".join(user.split())[:200]}
+
+
+class MockBackend(LLMBackend):
+    # 같은 요청에는 항상 같은 응답 - 비용 없이 처리량 비교와 개발용 실행에 사용
+    name = "mock"
+    supports_batching = True
+
+    def __init__(self, model="mock", latency=0.0, max_concurrency=64):
+        self.model = model
+        self.latency = latency
+        self.max_concurrency = max_concurrency
+
+    def respond(self, messages):
+        payload = json.dumps(messages, ensure_ascii=False, sort_keys=True)
+        seed = int.from_bytes(
+            hashlib.sha256(payload.encode("utf-8")).digest()[:8], "big"
+        )
+        content = json.dumps(
+            mock_response(messages, random.Random(seed)), ensure_ascii=False
+        )
+        return Completion(
+            content=content,
+            model=self.model,
+            usage={
+                "prompt_tokens": estimate_tokens(payload),
+                "completion_tokens": estimate_tokens(content),
+                "cached_tokens": 0,
+            },
+        )
+
+    def complete(self, messages, json_mode=True):
+        if self.latency:
+            time.sleep(self.latency)
+        return self.respond(messages)
+
+    def complete_batch(self, requests, json_mode=True):
+        # 배치 전체를 한 번의 지연으로 처리
+        if self.latency:
+            time.sleep(self.latency)
+        return [self.respond(messages) for messages in requests]
+
+
+def get_backend(name=None, model=None, base_url=None, max_concurrency=None):
+    # 인자가 없으면 환경 변수(LLM_BACKEND, LLM_MODEL, LLM_BASE_URL, LLM_CONCURRENCY) 사용
+    name = name or os.getenv("LLM_BACKEND", "openai")
+    model = model or os.getenv("LLM_MODEL")
+    base_url = base_url or os.getenv("LLM_BASE_URL")
+    max_concurrency = max_concurrency or int(os.getenv("LLM_CONCURRENCY", "0"))
+
+    kwargs = {}
+    if model:
+        kwargs["model"] = model
+    if max_concurrency:
+        kwargs["max_concurrency"] = max_concurrency
+
+    if name == "openai":
+        return OpenAIBackend(base_url=base_url, **kwargs)
+    if name == "local":
+        if base_url:
+            kwargs["base_url"] = base_url
+        return LocalOpenAIBackend(**kwargs)
+    if name == "mock":
+        return MockBackend(latency=float(os.getenv("MOCK_LATENCY", "0")), **kwargs)
+    raise ValueError(
+        f"알 수 없는 백엔드입니다: {name} (사용 가능: {', '.join(BACKENDS)})"
+    )
+
+
+def add_backend_arguments(parser):
+    parser.add_argument(
+        "--backend", choices=BACKENDS, help="LLM 백엔드 (기본: LLM_BACKEND 또는 openai)"
+    )
+    parser.add_argument("--model", help="모델 이름 (기본: 백엔드별 기본값)")
+    parser.add_argument("--base-url", help="OpenAI 호환 서버 주소")
+    parser.add_argument(
+        "--concurrency", type=int, help="동시 요청 수 (기본: 백엔드별 기본값)"
+    )
+    parser.add_argument(
+        "--cassette", help="요청/응답 기록 파일 (기본: LLM_CASSETTE, 없으면 사용 안 함)"
+    )
+    parser.add_argument(
+        "--cassette-mode",
+        choices=["record", "replay"],
+        help="record: 실제 호출을 기록, replay: 기록된 응답으로만 실행",
+    )
+
+
+def backend_from_args(args):
+    from cassette import RecordingBackend, ReplayBackend
+
+    path = args.cassette or os.getenv("LLM_CASSETTE")
+    mode = args.cassette_mode or os.getenv("LLM_CASSETTE_MODE", "replay")
+    if path and mode == "replay":
+        return ReplayBackend(
+            path, model=args.model, max_concurrency=args.concurrency or 64
+        )
+
+    backend = get_backend(args.backend, args.model, args.base_url, args.concurrency)
+    if path:
+        return RecordingBackend(backend, path)
+    return backend
@@ -0,0 +1,129 @@
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import resource
+import statistics
+import time
+
+from backends import LLMBackend, LocalOpenAIBackend
+from mock_server import add_server_arguments, start_server
+from synthetic import generate_forms
+
+DEFAULT_SIZES = [100, 1000, 10000]
+
+
+class TimedBackend(LLMBackend):
+    # 호출별 지연 시간을 기록하는 래퍼
+    def __init__(self, inner):
+        self.inner = inner
+        self.name = inner.name
+        self.model = inner.model
+        self.max_concurrency = inner.max_concurrency
+        self.supports_batching = inner.supports_batching
+        self.latencies = []
+
+    def complete(self, messages, json_mode=True):
+        start = time.perf_counter()
+        try:
+            return self.inner.complete(messages, json_mode)
+        finally:
+            self.latencies.append(time.perf_counter() - start)
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, round(q / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def run_case(url, size, concurrency, seed, queue):
+    # 별도 프로세스에서 실행 - 최대 메모리(ru_maxrss)를 크기별로 따로 측정
+    from evaluation import evaluate_all
+
+    cohort = generate_forms(size, seed)
+    backend = TimedBackend(
+        LocalOpenAIBackend(model="gpt-4o", base_url=url, max_concurrency=concurrency)
+    )
+
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        results = evaluate_all(cohort, backend)
+    elapsed = time.perf_counter() - start
+
+    queue.put(
+        {
+            "applicants": size,
+            "completed": len(results),
+            "concurrency": concurrency,
+            "seconds": elapsed,
+            "applicants_per_second": len(results) / elapsed,
+            "latency_p50": percentile(backend.latencies, 50),
+            "latency_p95": percentile(backend.latencies, 95),
+            "latency_p99": percentile(backend.latencies, 99),
+            "latency_mean": statistics.fmean(backend.latencies),
+            # 리눅스에서 ru_maxrss 단위는 KB
+            "peak_memory_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        }
+    )
+
+
+def print_table(rows):
+    header = f"{'지원자 수':>10} {'동시':>5} {'초':>8} {'명/초':>8} {'p50':>7} {'p95':>7} {'p99':>7} {'메모리MB':>9}"
+    print(header)
+    for row in rows:
+        print(
+            f"{row['applicants']:>10} {row['concurrency']:>5} {row['seconds']:>8.2f} "
+            f"{row['applicants_per_second']:>8.1f} {row['latency_p50']:>7.3f} "
+            f"{row['latency_p95']:>7.3f} {row['latency_p99']:>7.3f} {row['peak_memory_mb']:>9.1f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="평가 파이프라인 처리량 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--json", help="결과 저장 경로")
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    server = start_server(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        response_chars=args.response_chars,
+        seed=args.seed,
+        token_latency=args.token_latency,
+    )
+    print(f"모의 서버: {server.url} (지연 {args.latency}, 429 비율 {args.error_rate})")
+
+    context = multiprocessing.get_context("spawn")
+    rows = []
+    for size in args.sizes:
+        queue = context.Queue()
+        process = context.Process(
+            target=run_case, args=(server.url, size, args.concurrency, args.seed, queue)
+        )
+        process.start()
+        process.join()
+        if process.exitcode != 0:
+            raise SystemExit(
+                f"{size}명 벤치마크가 실패했습니다 (exit {process.exitcode})."
+            )
+        rows.append(queue.get())
+        print(f"{size}명 완료: {rows[-1]['applicants_per_second']:.1f}명/초")
+
+    print()
+    print_table(rows)
+    print(f"\n서버 요청 {server.requests}건 (429 {server.throttled}건)")
+    server.shutdown()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=4, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
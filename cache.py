@@ -0,0 +1,36 @@
+import hashlib
+import json
+import os
+import threading
+
+CACHE_DIR = os.getenv("CACHE_DIR", ".cache")
+
+
+def fingerprint(*parts):
+    # 입력 내용이 같으면 항상 같은 키가 나오도록 정렬된 JSON 으로 해시
+    payload = json.dumps(parts, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class JsonCache:
+    def __init__(self, name, directory=None):
+        self.directory = os.path.join(directory or CACHE_DIR, name)
+
+    def path(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def get(self, key):
+        try:
+            with open(self.path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def set(self, key, value):
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 동시에 쓰는 스레드/프로세스가 있어도 깨진 파일이 남지 않도록 임시 파일 후 교체
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(value, f, ensure_ascii=False)
+        os.replace(tmp, path)
@@ -0,0 +1,188 @@
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+from backends import Completion, LLMBackend
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS blobs (hash TEXT PRIMARY KEY, data BLOB NOT NULL);
+CREATE TABLE IF NOT EXISTS interactions (
+    fingerprint TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    request TEXT NOT NULL,
+    response BLOB NOT NULL,
+    recorded_at REAL NOT NULL
+);
+"""
+
+
+class CassetteMiss(KeyError):
+    pass
+
+
+def request_fingerprint(model, messages, json_mode=True):
+    payload = json.dumps(
+        [model, messages, json_mode], ensure_ascii=False, sort_keys=True
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def compress(value):
+    return zlib.compress(json.dumps(value, ensure_ascii=False).encode("utf-8"), 6)
+
+
+def decompress(data):
+    return json.loads(zlib.decompress(data).decode("utf-8"))
+
+
+class Cassette:
+    # 요청/응답 쌍을 저장하는 SQLite 아카이브 - 지문(fingerprint)이 기본 키(인덱스)
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def meta(self, key):
+        row = self.conn.execute(
+            "SELECT value FROM meta WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def put(self, fingerprint, model, messages, completion):
+        # 시스템 프롬프트처럼 반복되는 메시지 본문은 blobs 에 한 번만 저장
+        request = []
+        rows = []
+        for message in messages:
+            content = message["content"]
+            digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+            rows.append((digest, zlib.compress(content.encode("utf-8"), 6)))
+            request.append({"role": message["role"], "content": digest})
+
+        response = compress(
+            {
+                "content": completion.content,
+                "model": completion.model,
+                "usage": completion.usage,
+                "headers": completion.headers,
+            }
+        )
+        with self.lock:
+            self.conn.executemany("INSERT OR IGNORE INTO blobs VALUES (?, ?)", rows)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO interactions VALUES (?, ?, ?, ?, ?)",
+                (fingerprint, model, json.dumps(request), response, time.time()),
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('model', ?)", (model,)
+            )
+            self.conn.commit()
+
+    def get(self, fingerprint):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT response FROM interactions WHERE fingerprint = ?",
+                (fingerprint,),
+            ).fetchone()
+        if row is None:
+            return None
+        return Completion(**decompress(row[0]))
+
+    def messages(self, fingerprint):
+        # 저장된 요청 메시지 복원 (디버깅용)
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT request FROM interactions WHERE fingerprint = ?",
+                (fingerprint,),
+            ).fetchone()
+            if row is None:
+                return None
+            messages = []
+            for message in json.loads(row[0]):
+                data = self.conn.execute(
+                    "SELECT data FROM blobs WHERE hash = ?", (message["content"],)
+                ).fetchone()[0]
+                messages.append(
+                    {
+                        "role": message["role"],
+                        "content": zlib.decompress(data).decode("utf-8"),
+                    }
+                )
+            return messages
+
+    def count(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM interactions").fetchone()[0]
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+class RecordingBackend(LLMBackend):
+    # 실제 백엔드 호출 결과를 카세트에 기록
+    def __init__(self, inner, path):
+        self.inner = inner
+        self.cassette = Cassette(path)
+        self.name = f"{inner.name}+record"
+        self.model = inner.model
+        self.max_concurrency = inner.max_concurrency
+        self.supports_batching = inner.supports_batching
+
+    def complete(self, messages, json_mode=True):
+        completion = self.inner.complete(messages, json_mode)
+        fingerprint = request_fingerprint(self.model, messages, json_mode)
+        self.cassette.put(fingerprint, self.model, messages, completion)
+        return completion
+
+
+class ReplayBackend(LLMBackend):
+    # 기록된 응답을 요청 지문으로 찾아 바로 반환 - 네트워크와 비용 없이 재실행
+    name = "replay"
+    supports_batching = True
+
+    def __init__(self, path, model=None, max_concurrency=64):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"카세트 파일이 없습니다: {path}")
+        self.cassette = Cassette(path)
+        self.model = model or self.cassette.meta("model") or "gpt-4o"
+        self.max_concurrency = max_concurrency
+
+    def complete(self, messages, json_mode=True):
+        fingerprint = request_fingerprint(self.model, messages, json_mode)
+        completion = self.cassette.get(fingerprint)
+        if completion is None:
+            raise CassetteMiss(
+                f"카세트에 없는 요청입니다 ({fingerprint[:12]}). 프롬프트나 입력이 바뀌었다면 다시 기록하세요."
+            )
+        return completion
+
+    def complete_batch(self, requests, json_mode=True):
+        return [self.complete(messages, json_mode) for messages in requests]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="카세트 파일 정보 확인")
+    parser.add_argument("path")
+    parser.add_argument("--show", help="지문으로 저장된 요청/응답 출력")
+    args = parser.parse_args()
+
+    cassette = Cassette(args.path)
+    print(
+        f"{args.path}: {cassette.count()}건, 모델 {cassette.meta('model')}, {os.path.getsize(args.path) / 1024:.1f}KB"
+    )
+    if args.show:
+        print(json.dumps(cassette.messages(args.show), indent=4, ensure_ascii=False))
+        completion = cassette.get(args.show)
+        print(completion.content if completion else "응답 없음")
+
+
+if __name__ == "__main__":
+    main()
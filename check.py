@@ -1,41 +1,71 @@
-import json
+import argparse
 from collections import Counter
 
-with open("evaluation_results_enhanced_ver2.json", "r", encoding="utf-8") as f:
-    evaluation_results = json.load(f)
-
-# 평가 항목별 점수 카운터 초기화
-score_counters = {
-    "지원 동기 및 진정성": Counter(),
-    "논리적 표현력": Counter(),
-    "활동경험": Counter(),
-    "성실성(성의)": Counter(),
-}
-
-# 전체 점수 카운터
-total_scores = Counter()
-
-# 각 지원자의 평가 결과를 분석
-for result in evaluation_results:
-    if "evaluation_result" in result:
-        for category, data in result["evaluation_result"].items():
-            if "score" in data:
-                score = data["score"]
-                score_counters[category][score] += 1
-                total_scores[score] += 1
-
-# 결과 출력
-print("=== 평가 항목별 점수 분포 ===")
-for category, counter in score_counters.items():
-    print(f"\n{category}:")
-    for score in ["A", "B", "C", "G", "P", "NP"]:
-        count = counter.get(score, 0)
-        print(f"  {score}: {count}명")
-
-print("\n=== 전체 점수 분포 ===")
-for score in ["A", "B", "C", "G", "P", "NP"]:
-    count = total_scores.get(score, 0)
-    print(f"{score}: {count}개")
-
-# 지원자 수 출력
-print(f"\n총 지원자 수: {len(evaluation_results)}명")
+from results_io import SCORE_ORDER, iter_results, order_labels
+
+DEFAULT_FILES = ["evaluation_results_enhanced_ver2.json"]
+
+
+def aggregate(paths):
+    # 평가 항목별 점수 카운터 (항목은 데이터에서 발견되는 대로 추가)
+    score_counters = {}
+
+    # 전체 점수 카운터
+    total_scores = Counter()
+
+    # 파일별 지원자 수
+    applicant_counts = Counter()
+
+    # 각 지원자의 평가 결과를 한 명씩 읽으면서 분석
+    for path in paths:
+        for result in iter_results(path):
+            applicant_counts[path] += 1
+            if "evaluation_result" in result:
+                for category, data in result["evaluation_result"].items():
+                    if "score" in data:
+                        score = data["score"]
+                        score_counters.setdefault(category, Counter())[score] += 1
+                        total_scores[score] += 1
+
+    return score_counters, total_scores, applicant_counts
+
+
+def print_report(score_counters, total_scores, applicant_counts):
+    # 기본 점수는 항상 출력하고, 데이터에서 발견된 새 점수는 뒤에 추가
+    scores = order_labels(SCORE_ORDER + list(total_scores))
+
+    print("=== 평가 항목별 점수 분포 ===")
+    for category, counter in score_counters.items():
+        print(f"\n{category}:")
+        for score in scores:
+            count = counter.get(score, 0)
+            print(f"  {score}: {count}명")
+
+    print("\n=== 전체 점수 분포 ===")
+    for score in scores:
+        count = total_scores.get(score, 0)
+        print(f"{score}: {count}개")
+
+    # 지원자 수 출력
+    if len(applicant_counts) > 1:
+        print()
+        for path, count in applicant_counts.items():
+            print(f"{path}: {count}명")
+    print(f"\n총 지원자 수: {sum(applicant_counts.values())}명")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="평가 결과 점수 분포 집계")
+    parser.add_argument(
+        "files",
+        nargs="*",
+        default=DEFAULT_FILES,
+        help="평가 결과 파일 (.json, .jsonl 체크포인트, .gz 압축본)",
+    )
+    args = parser.parse_args()
+
+    print_report(*aggregate(args.files))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import numpy as np
+
+from cache import JsonCache, fingerprint
+
+UNASSIGNED = -1
+
+cluster_cache = JsonCache("clusters")
+
+
+def kmeans(matrix, k, iterations=50, seed=0):
+    # 정규화된 행끼리 코사인 유사도로 묶는 k-means (중심도 매번 정규화)
+    # 단어가 하나도 없는 행(영벡터)은 UNASSIGNED
+    matrix = np.asarray(matrix, dtype=np.float32)
+    rng = np.random.default_rng(seed)
+    active = np.flatnonzero(np.abs(matrix).sum(axis=1) > 0)
+    labels = np.full(len(matrix), UNASSIGNED, dtype=np.int32)
+    k = min(k, len(active))
+    if k == 0:
+        return labels, np.zeros((0, matrix.shape[1]), dtype=np.float32)
+    points = matrix[active]
+
+    # k-means++ 초기화 - 이미 고른 중심과 먼(유사도 낮은) 점일수록 잘 뽑힘
+    centroids = [points[rng.integers(len(points))]]
+    distance = 1 - points @ centroids[0]
+    for _ in range(1, k):
+        weights = np.clip(distance, 0, None)
+        total = weights.sum()
+        choice = (
+            rng.choice(len(points), p=weights / total)
+            if total > 0
+            else rng.integers(len(points))
+        )
+        centroids.append(points[choice])
+        distance = np.minimum(distance, 1 - points @ points[choice])
+    centroids = np.array(centroids)
+
+    assigned = None
+    for _ in range(iterations):
+        current = np.argmax(points @ centroids.T, axis=1)
+        if assigned is not None and np.array_equal(current, assigned):
+            break
+        assigned = current
+        sums = np.stack([points[assigned == c].sum(axis=0) for c in range(k)])
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        # 빈 군집은 이전 중심 유지
+        centroids = np.where(norms > 0, sums / np.where(norms > 0, norms, 1), centroids)
+
+    labels[active] = assigned
+    return labels, centroids
+
+
+def representative_terms(centroids, vocabulary, mean, limit=8):
+    # 중심 벡터가 전체 평균보다 특히 큰 단어 - 어느 군집에나 많은 단어는 뒤로 밀림
+    return [
+        [vocabulary[i] for i in np.argsort(mean - centroid, kind="stable")[:limit]]
+        for centroid in centroids
+    ]
+
+
+def cluster_applicants(index, k, seed=0):
+    # {"labels": 지원자별 군집 번호, "sizes": 군집별 인원, "terms": 군집별 대표 단어}
+    # 군집 번호는 큰 군집부터 0, 1, 2 ...
+    matrix = np.asarray(index.matrix, dtype=np.float32)
+    labels, centroids = kmeans(matrix, k, seed=seed)
+    counts = np.bincount(labels[labels >= 0], minlength=len(centroids))
+    order = np.argsort(-counts, kind="stable")
+    rename = np.empty(len(order), dtype=np.int32)
+    rename[order] = np.arange(len(order))
+    labels = np.where(labels >= 0, rename[np.clip(labels, 0, None)], UNASSIGNED)
+    return {
+        "labels": labels.tolist(),
+        "sizes": counts[order].tolist(),
+        "terms": representative_terms(
+            centroids[order], index.vocabulary, matrix.mean(axis=0)
+        ),
+    }
+
+
+def load_or_cluster(index, path, mtime, k, seed=0):
+    # 데이터 버전(경로, 수정 시각)과 k 가 같으면 디스크에 저장된 결과 사용
+    key = fingerprint("clusters", path, mtime, index.vocabulary, k, seed)
+    clusters = cluster_cache.get(key)
+    if clusters is None or len(clusters["labels"]) != len(index.matrix):
+        clusters = cluster_applicants(index, k, seed)
+        cluster_cache.set(key, clusters)
+    return clusters
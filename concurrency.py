@@ -0,0 +1,140 @@
+import statistics
+import threading
+import time
+from contextlib import contextmanager
+
+
+class FixedLimit:
+    # 고정된 동시 요청 수 (백엔드의 max_concurrency) - slot() 은 AIMDController 와 같게 사용
+    def __init__(self, limit):
+        self.limit = max(1, limit)
+        self.semaphore = threading.BoundedSemaphore(self.limit)
+
+    @contextmanager
+    def slot(self):
+        with self.semaphore:
+            yield
+
+
+class AIMDController:
+    # 동시 요청 수 자동 조절 - 정상이면 한 바퀴(limit 건 완료)마다 +increase,
+    # 429 나 꼬리 지연이 기준의 latency_factor 배를 넘으면 limit * decrease 로 줄임
+    def __init__(
+        self,
+        initial=8,
+        minimum=1,
+        maximum=256,
+        increase=1,
+        decrease=0.5,
+        latency_factor=2.0,
+        window=20,
+        recorder=None,
+    ):
+        self.limit = max(minimum, min(maximum, initial))
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_factor = latency_factor
+        self.window = window
+        self.recorder = recorder
+        self.lock = threading.Lock()
+        # slot() 으로 실제 보내는 요청 수를 limit 이하로 유지 (평가와 조각 요약 모두)
+        self.available = threading.Condition(self.lock)
+        self.active = 0
+        self.latencies = []
+        self.baseline = None
+        self.since_change = 0
+        self.cooldown = self.limit
+        self.history = []
+        self.record(self.limit, "start")
+
+    def record(self, limit, reason):
+        self.history.append({"time": time.time(), "limit": limit, "reason": reason})
+        if self.recorder is not None:
+            self.recorder.set_gauge("concurrency_limit", limit, reason)
+
+    def observe(self, entry):
+        # MetricsRecorder 가 호출마다 넘겨주는 기록 (latency, throttled, error)
+        with self.lock:
+            self.since_change += 1
+            throttled = entry.get("throttled", 0) > 0 or "RateLimit" in (
+                entry.get("error") or ""
+            )
+            if not entry.get("error"):
+                self.latencies.append(entry["latency"])
+
+            reason = None
+            if throttled:
+                reason = "429"
+            elif len(self.latencies) >= self.window:
+                window = sorted(self.latencies[-self.window :])
+                median = statistics.median(window)
+                tail = window[int(len(window) * 0.95) - 1]
+                # 기준 지연은 지금까지 본 가장 낮은 구간 중앙값 (부하가 없을 때의 지연)
+                self.baseline = (
+                    median if self.baseline is None else min(self.baseline, median)
+                )
+                del self.latencies[: -self.window]
+                if tail > self.baseline * self.latency_factor:
+                    reason = "latency"
+
+            if self.since_change < self.cooldown:
+                return
+            if reason is not None:
+                self.change(max(self.minimum, int(self.limit * self.decrease)), reason)
+                # 줄이기 전에 이미 보낸 요청이 모두 돌아올 때까지는 다시 판단하지 않음
+                # (그 요청들의 429 와 지연으로 연속해서 줄어드는 것 방지)
+                self.cooldown = self.in_flight_at_change
+                self.latencies.clear()
+            elif self.limit < self.maximum:
+                self.change(min(self.maximum, self.limit + self.increase), "healthy")
+                self.cooldown = self.limit
+
+    def change(self, limit, reason):
+        self.in_flight_at_change = self.limit
+        self.since_change = 0
+        if limit != self.limit:
+            self.limit = limit
+            self.record(limit, reason)
+            self.available.notify_all()
+
+    @contextmanager
+    def slot(self):
+        # 요청 하나를 보내는 동안 자리 하나를 차지 - 자리가 없으면 다른 요청이 끝날 때까지 대기
+        with self.available:
+            while self.active >= self.limit:
+                self.available.wait()
+            self.active += 1
+        try:
+            yield
+        finally:
+            with self.available:
+                self.active -= 1
+                self.available.notify()
+
+    def mean_limit(self, start, end):
+        # start~end 동안의 시간 가중 평균 limit (각 값은 다음 변경 전까지 유지된 것으로 봄)
+        with self.lock:
+            history = list(self.history)
+        if end <= start:
+            return float(self.limit)
+        total = 0.0
+        for row, following in zip(history, history[1:] + [{"time": end}]):
+            begin = max(start, row["time"])
+            finish = min(end, following["time"])
+            if finish > begin:
+                total += row["limit"] * (finish - begin)
+        return total / (end - start)
+
+    def summary(self):
+        limits = [row["limit"] for row in self.history]
+        return {
+            "final": self.limit,
+            "min": min(limits),
+            "max": max(limits),
+            "changes": len(self.history) - 1,
+            "decreases": sum(
+                1 for row in self.history if row["reason"] in ["429", "latency"]
+            ),
+        }
@@ -0,0 +1,177 @@
+import argparse
+import hashlib
+import json
+
+from backends import add_backend_arguments, backend_from_args, estimate_tokens
+from cache import JsonCache, fingerprint
+from results_io import applicant_key, iter_results
+
+# 프롬프트를 바꾸면 이전 캐시가 재사용되지 않도록 키에 포함
+PROMPT_VERSION = "1"
+
+MAP_PROMPT = """
+너는 학회 지원자들의 지원서 요약을 읽고 지원자 집단 전체의 경향을 정리해야 해.
+아래 <지원자_요약> 에는 여러 지원자의 지원서 요약이 들어 있어. 개별 지원자를 평가하지 말고, 공통적으로 나타나는 내용을 묶어서 정리해줘.
+
+너의 응답은 다음과 같은 JSON 형식으로 제시돼야 해:
+{
+    "motivations": [{"theme": "지원 동기 주제", "count": 해당 지원자 수, "examples": ["지원자 이름", ...]}],
+    "goal_themes": [{"theme": "인생 목표 주제", "count": 해당 지원자 수, "examples": ["지원자 이름", ...]}],
+    "standout_experiences": [{"theme": "눈에 띄는 경험", "count": 해당 지원자 수, "examples": ["지원자 이름", ...]}]
+}
+"""
+
+REDUCE_PROMPT = """
+너는 학회 지원자 집단에 대한 부분 정리 결과 여러 개를 하나로 합쳐야 해.
+아래 <부분_정리> 에는 같은 JSON 형식의 정리 결과가 여러 개 들어 있어. 비슷한 주제는 하나로 합치고, count 는 더하고, examples 는 대표적인 이름 5명 이내로 남겨줘.
+각 목록은 count 가 큰 순서로 정렬하고, 최대 15개 주제까지만 남겨줘.
+
+너의 응답은 입력과 같은 JSON 형식(motivations, goal_themes, standout_experiences)으로 제시돼야 해.
+"""
+
+SECTIONS = {
+    "motivations": "주요 지원 동기",
+    "goal_themes": "목표 테마",
+    "standout_experiences": "눈에 띄는 경험",
+}
+
+# 배치 경계를 내용(키 해시)으로 정해서, 지원자가 추가돼도 앞쪽 배치가 그대로 유지되도록 함
+BOUNDARY_MODULUS = 8
+
+cache = JsonCache("digest")
+
+
+def applicant_text(result):
+    lines = [f"[{result.get('user_name', '')}]"]
+    for problem, summary in result.get("summarization", {}).items():
+        lines.append(f"- {problem}: {summary}")
+    return "\n".join(lines)
+
+
+def is_boundary(key):
+    digest = hashlib.sha256(key.encode("utf-8")).digest()
+    return digest[0] % BOUNDARY_MODULUS == 0
+
+
+def batch_items(items, budget):
+    # items: [(키, 텍스트)] -> 토큰 예산을 넘지 않는 배치 목록
+    batches = []
+    current = []
+    used = 0
+    for key, text in items:
+        tokens = estimate_tokens(text)
+        if current and used + tokens > budget:
+            batches.append(current)
+            current, used = [], 0
+        current.append((key, text))
+        used += tokens
+        if used >= budget / 2 and is_boundary(key):
+            batches.append(current)
+            current, used = [], 0
+    if current:
+        batches.append(current)
+    return batches
+
+
+class CohortDigest:
+    def __init__(self, backend, budget=6000):
+        self.backend = backend
+        self.budget = budget
+        self.computed = 0
+        self.cached = 0
+
+    def run_level(self, prompt, tag, batches):
+        # 노드 키는 자식 키들로 정해짐 (머클 트리) - 바뀐 가지만 다시 계산
+        keys = [
+            fingerprint(
+                PROMPT_VERSION, self.backend.model, prompt, [k for k, _ in batch]
+            )
+            for batch in batches
+        ]
+        values = [cache.get(key) for key in keys]
+        missing = [i for i, value in enumerate(values) if value is None]
+        self.cached += len(batches) - len(missing)
+        self.computed += len(missing)
+
+        # 한 레벨의 노드는 서로 독립적이므로 한꺼번에 요청
+        requests = []
+        for i in missing:
+            content = "\n\n".join(text for _, text in batches[i])
+            requests.append(
+                [
+                    {"role": "system", "content": prompt},
+                    {"role": "user", "content": f"<{tag}>\n{content}\n</{tag}>"},
+                ]
+            )
+        for i, completion in zip(missing, self.backend.complete_batch(requests)):
+            values[i] = json.loads(completion.content)
+            cache.set(keys[i], values[i])
+
+        return list(zip(keys, values))
+
+    def build(self, results):
+        # 잎 노드의 키는 지원자 요약 내용의 해시
+        items = []
+        for result in results:
+            text = applicant_text(result)
+            items.append((fingerprint(applicant_key(result), text), text))
+        if not items:
+            return None
+
+        nodes = self.run_level(
+            MAP_PROMPT, "지원자_요약", batch_items(items, self.budget)
+        )
+        level = 1
+        print(f"레벨 {level}: {len(nodes)}개 노드")
+
+        while len(nodes) > 1:
+            items = [
+                (key, json.dumps(value, ensure_ascii=False)) for key, value in nodes
+            ]
+            batches = batch_items(items, self.budget)
+            # 예산 안에 두 개 이상 들어가지 않으면 강제로 두 개씩 묶어 트리 높이를 줄임
+            if len(batches) == len(items):
+                batches = [items[i : i + 2] for i in range(0, len(items), 2)]
+            nodes = self.run_level(REDUCE_PROMPT, "부분_정리", batches)
+            level += 1
+            print(f"레벨 {level}: {len(nodes)}개 노드")
+
+        return nodes[0][1]
+
+
+def print_digest(digest):
+    for section, title in SECTIONS.items():
+        print(f"\n=== {title} ===")
+        for entry in digest.get(section, []):
+            examples = ", ".join(entry.get("examples", []))
+            print(f"- {entry.get('theme')} ({entry.get('count')}명) {examples}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="지원자 전체 요약(코호트 다이제스트) 생성"
+    )
+    parser.add_argument(
+        "files", nargs="*", default=["evaluation_results_enhanced_ver2.json"]
+    )
+    parser.add_argument("--budget", type=int, default=6000, help="배치당 토큰 예산")
+    add_backend_arguments(parser)
+    parser.add_argument("--output", default="cohort_digest.json")
+    args = parser.parse_args()
+
+    results = [result for path in args.files for result in iter_results(path)]
+    builder = CohortDigest(backend_from_args(args), budget=args.budget)
+    digest = builder.build(results)
+    print(f"새로 계산한 노드 {builder.computed}개, 캐시 사용 {builder.cached}개")
+
+    if digest is None:
+        print("요약할 지원자가 없습니다.")
+        return
+
+    print_digest(digest)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(digest, f, indent=4, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,30 @@
-from openai import OpenAI
+import argparse
 import json
+import re
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from dotenv import load_dotenv
 import os
+import time
+
+from backends import add_backend_arguments, backend_from_args, estimate_tokens
+from cache import JsonCache, fingerprint
+from concurrency import AIMDController
+from hedging import HedgedBackend
+from metrics import BudgetExceeded, InstrumentedBackend, MetricsRecorder, call_context
+from monitor import DRIFT_ACTIONS, DistributionMonitor, format_alert
+from profiling import profiler, span
+from results_io import iter_results
+from scheduling import (
+    SCHEDULES,
+    LatencyModel,
+    LatencyObserver,
+    longest_first,
+    makespan_report,
+    print_makespan,
+)
 
 load_dotenv()
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-
 SYSTEM_PROMPT = """
 너는 내가 학회의 지원서를 검토하는 것을 도와줘야 해. 지원서 평가 항목과, 각각의 평가 기준은 다음과 같아:
 
@@ -90,6 +108,35 @@ USER_PROMPT = """
 </지원서_내용>
 """
 
+# 지원서가 이 글자 수를 넘으면 문항별로 나눠 요약한 뒤 그 요약본으로 평가
+LONG_FORM_CHARS = int(os.getenv("LONG_FORM_CHARS", "6000"))
+
+# 한 번에 요약할 조각의 최대 글자 수
+CHUNK_CHARS = int(os.getenv("CHUNK_CHARS", "3000"))
+
+# 이어지는 조각 앞에 붙이는 문항 첫 줄의 최대 글자 수
+HEADER_CHARS = 200
+
+# 프롬프트를 바꾸면 이전 조각 요약 캐시가 재사용되지 않도록 키에 포함
+CHUNK_PROMPT_VERSION = "1"
+
+CHUNK_PROMPT = """
+너는 학회 지원서의 일부(한 문항 또는 그 일부)를 평가자가 읽을 수 있도록 정리해야 해.
+이 정리본은 원문 대신 평가에 사용되기 때문에 다음을 반드시 지켜줘:
+- 문항 번호와 질문, 표시된 글자 수 정보를 그대로 남길 것
+- 지원 동기, 목표와 계획, 활동 경험의 구체적인 사실(기관명, 기간, 역할, 수치, 성과)은 빠짐없이 남길 것
+- 글의 논리적 흐름과 구성, 문장 표현의 특징, 오탈자나 성의 없어 보이는 부분, 인공지능이 쓴 것 같은 흔적이 있다면 원문 문장을 인용해서 남길 것
+- 내용을 평가하거나 점수를 매기지 말 것
+
+너의 응답은 다음과 같은 JSON 형식으로 제시돼야 해:
+{
+    "question": "문항 번호와 질문",
+    "summary": "정리된 내용"
+}
+"""
+
+chunk_cache = JsonCache("chunks")
+
 application_forms = [
     {
         "user_info": """성명 강민서 성별 여
@@ -1886,29 +1933,408 @@ AIESEC 국내프로젝트부서에서 팀 리더로서 영어 교육 봉사 프
     },
 ]
 
-print(len(application_forms))
-
-evaluation_results = []
 
-for i, application_form in enumerate(application_forms):
-    evaluation = client.chat.completions.create(
-        model="gpt-4o",
-        messages=[
+def split_application_form(text):
+    # 문항 번호("1)", "2)" ...)로 시작하는 줄을 기준으로 문항 단위로 나눔
+    questions = [q.strip() for q in re.split(r"(?m)^(?=\s*\d+\)\s)", text) if q.strip()]
+
+    chunks = []
+    for question in questions:
+        if len(question) <= CHUNK_CHARS:
+            chunks.append(question)
+            continue
+        # 너무 긴 문항은 줄 단위로 잘라서 여러 조각으로 나누고, 문항 첫 줄을 앞에 붙여 맥락 유지
+        # 한 줄이 조각보다 긴 경우(줄바꿈 없는 문단, 붙여 넣은 포트폴리오)는 문장 단위로 다시 자름
+        continuation = f"{question.splitlines()[0][:HEADER_CHARS]} (이어서)\n"
+        limit = CHUNK_CHARS - len(continuation)
+        current = ""
+        for line in question.splitlines(keepends=True):
+            for piece in split_line(line, limit):
+                if current and len(current) + len(piece) > CHUNK_CHARS:
+                    chunks.append(current)
+                    current = continuation
+                current += piece
+        chunks.append(current)
+    return chunks
+
+
+def split_line(line, limit):
+    # 문장 끝(. ! ? 뒤 공백)에서 나누어 limit 이하로 묶고, 그래도 긴 문장은 limit 글자씩 자름
+    if len(line) <= limit:
+        return [line]
+    sentences = []
+    for sentence in re.split(r"(?<=[.!?]\s)", line):
+        sentences.extend(
+            sentence[start : start + limit] for start in range(0, len(sentence), limit)
+        )
+    pieces = []
+    for sentence in sentences:
+        if pieces and len(pieces[-1]) + len(sentence) <= limit:
+            pieces[-1] += sentence
+        else:
+            pieces.append(sentence)
+    return pieces
+
+
+def summarize_chunks(chunks, backend):
+    keys = [
+        fingerprint(CHUNK_PROMPT_VERSION, backend.model, CHUNK_PROMPT, chunk)
+        for chunk in chunks
+    ]
+    with span("cache"):
+        summaries = [chunk_cache.get(key) for key in keys]
+
+    # 캐시에 없는 조각만 한 번에 요청 (배치를 지원하지 않는 백엔드는 동시 요청으로 처리)
+    missing = [i for i, summary in enumerate(summaries) if summary is None]
+    with call_context(stage="chunk"), span("chunk"):
+        completions = backend.complete_batch(
+            [
+                [
+                    {"role": "system", "content": CHUNK_PROMPT},
+                    {"role": "user", "content": chunks[i]},
+                ]
+                for i in missing
+            ]
+        )
+    for i, completion in zip(missing, completions):
+        with span("parse"):
+            summaries[i] = json.loads(completion.content)
+        with span("cache"):
+            chunk_cache.set(keys[i], summaries[i])
+    return summaries
+
+
+def reduce_application_form(text, backend):
+    if len(text) <= LONG_FORM_CHARS:
+        return text
+
+    summaries = summarize_chunks(split_application_form(text), backend)
+
+    lines = ["(분량이 길어 문항별로 정리한 내용으로 대체함)"]
+    for summary in summaries:
+        lines.append(f"\n{summary.get('question', '')}\n{summary.get('summary', '')}")
+    return "\n".join(lines)
+
+
+def evaluate_application(application_form, backend):
+    text = reduce_application_form(application_form["application_form"], backend)
+    with span("prompt"):
+        messages = [
             {"role": "system", "content": SYSTEM_PROMPT},
             {
                 "role": "user",
                 "content": USER_PROMPT.format(
-                    user_info=application_form["user_info"],
-                    application_form=application_form["application_form"],
+                    user_info=application_form["user_info"], application_form=text
                 ),
             },
-        ],
-        response_format={"type": "json_object"},
+        ]
+    with span("network"):
+        evaluation = backend.complete(messages)
+    with span("parse"):
+        return json.loads(evaluation.content)
+
+
+def evaluate_queued(i, application_form, backend, queued_at):
+    # 호출 기록에 지원자 번호와 대기 시간이 남도록 호출 정보를 붙여서 평가
+    # 대기 시간은 작업자가 이 지원자를 시작한 시점까지 (조각 요약 시간은 포함하지 않음)
+    with call_context(applicant=i, queue_wait=time.time() - queued_at):
+        return evaluate_application(application_form, backend)
+
+
+def check_drift(monitor, result, drift_action, done):
+    # 결과가 나올 때마다 점수 분포를 목표 비율과 비교 - 중단해야 하면 True
+    alerts = monitor.update(result)
+    print(monitor.summary())
+    for alert in alerts:
+        print(format_alert(alert))
+    if not alerts or drift_action == "warn":
+        return False
+    if drift_action == "pause":
+        answer = input(
+            "점수 분포가 목표에서 벗어났습니다. 계속하려면 Enter, 중단하려면 q: "
+        )
+        if answer.strip().lower() != "q":
+            return False
+    print(f"점수 분포 이탈로 {done}명에서 평가를 중단합니다.")
+    return True
+
+
+def estimate_form_tokens(application_form):
+    # 스케줄링용 대략적인 요청 크기 (프롬프트 + 지원서)
+    return estimate_tokens(
+        SYSTEM_PROMPT
+        + USER_PROMPT
+        + application_form["user_info"]
+        + application_form["application_form"]
     )
 
-    evaluation_results.append(json.loads(evaluation.choices[0].message.content))
-    print(evaluation_results[-1])
-    print(f"Evaluated {i+1}/{len(application_forms)} application forms")
 
-with open("evaluation_results_enhanced_ver2.json", "w", encoding="utf-8") as f:
-    json.dump(evaluation_results, f, indent=4, ensure_ascii=False)
+def evaluate_all(
+    application_forms,
+    backend,
+    monitor=None,
+    drift_action="warn",
+    controller=None,
+    order=None,
+    failures=None,
+):
+    # failures: 넘기면 평가에 실패한 지원자 {"index", "error"} 를 추가 (실패해도 나머지는 계속)
+    evaluation_results = [None] * len(application_forms)
+    # order: 보낼 순서 (지원자 번호 목록) - 결과는 항상 application_forms 순서
+    if order is None:
+        order = range(len(application_forms))
+    pending = ((i, application_forms[i]) for i in order)
+    in_flight = {}
+    done = 0
+    stopped = False
+
+    def limit():
+        # 조절기가 있으면 지금 허용된 동시 요청 수, 없으면 백엔드 고정값
+        return controller.limit if controller is not None else backend.max_concurrency
+
+    max_workers = controller.maximum if controller is not None else limit()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+
+        def fill():
+            for i, application_form in pending:
+                future = executor.submit(
+                    evaluate_queued, i, application_form, backend, time.time()
+                )
+                in_flight[future] = i
+                if len(in_flight) >= limit():
+                    return
+
+        # 허용된 동시 요청 수만큼만 보내고, 끝날 때마다 빈 자리만큼 다음 지원자를 보냄
+        fill()
+
+        while in_flight:
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                i = in_flight.pop(future)
+                try:
+                    evaluation_results[i] = future.result()
+                except BudgetExceeded as e:
+                    # 예산을 넘기 전에 멈춤 - 이미 보낸 요청만 마무리하고 결과는 저장
+                    if not stopped:
+                        print(f"{e}. {done}명에서 평가를 중단합니다.")
+                    stopped = True
+                    continue
+                except Exception as e:
+                    # JSON 형식 오류, 재시도 후에도 실패한 API 오류 등은 이 지원자만 건너뜀
+                    print(f"{i}번 지원자 평가 실패: {type(e).__name__}: {e}")
+                    if failures is not None:
+                        failures.append(
+                            {"index": i, "error": f"{type(e).__name__}: {e}"}
+                        )
+                    continue
+                done += 1
+                print(evaluation_results[i])
+                print(f"Evaluated {done}/{len(application_forms)} application forms")
+
+                if monitor is not None and not stopped:
+                    stopped = check_drift(
+                        monitor, evaluation_results[i], drift_action, done
+                    )
+            # 중단하면 새 지원자는 보내지 않고 이미 보낸 요청만 마무리
+            if not stopped and len(in_flight) < limit():
+                fill()
+
+    # 결과는 application_forms 순서대로 (중단된 경우 평가된 지원자만)
+    return [result for result in evaluation_results if result is not None]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="지원서 평가 실행")
+    parser.add_argument(
+        "--input", help="평가할 지원서 파일 (.json/.jsonl, 없으면 application_forms)"
+    )
+    parser.add_argument("--output", default="evaluation_results_enhanced_ver2.json")
+    add_backend_arguments(parser)
+    parser.add_argument(
+        "--drift-action",
+        choices=DRIFT_ACTIONS,
+        default=os.getenv("DRIFT_ACTION", "warn"),
+        help="점수 분포가 목표에서 벗어났을 때 동작",
+    )
+    parser.add_argument(
+        "--drift-threshold",
+        type=float,
+        default=float(os.getenv("DRIFT_THRESHOLD", "0.15")),
+        help="목표 비율과의 허용 차이 (비율, 기본 0.15)",
+    )
+    parser.add_argument(
+        "--drift-min-samples",
+        type=int,
+        default=10,
+        help="경고를 시작하기 전 최소 결과 수",
+    )
+    parser.add_argument(
+        "--no-monitor", action="store_true", help="점수 분포 모니터 끄기"
+    )
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=(
+            float(os.getenv("LLM_BUDGET_USD")) if os.getenv("LLM_BUDGET_USD") else None
+        ),
+        help="이번 실행의 비용 상한 (USD)",
+    )
+    parser.add_argument(
+        "--metrics-dir", default="runs", help="호출 기록과 지표를 저장할 폴더"
+    )
+    parser.add_argument("--run-id", help="실행 ID (기본: 시작 시각)")
+    parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        default=os.getenv("LLM_ADAPTIVE", "") not in ("", "0"),
+        help="지연 시간과 429 에 따라 동시 요청 수 자동 조절 (--concurrency 에서 시작)",
+    )
+    parser.add_argument(
+        "--schedule",
+        choices=SCHEDULES,
+        default="longest",
+        help="지원자를 보내는 순서 (longest: 예상 토큰 수가 큰 것부터, input: 입력 순서)",
+    )
+    parser.add_argument(
+        "--hedge",
+        action="store_true",
+        default=os.getenv("LLM_HEDGE", "") not in ("", "0"),
+        help="느린 호출은 최근 지연의 p95 가 지나면 같은 요청을 한 번 더 보냄",
+    )
+    parser.add_argument(
+        "--hedge-quantile",
+        type=float,
+        default=0.95,
+        help="중복 요청을 보내기 시작하는 지연 분위수",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=256,
+        help="자동 조절 시 동시 요청 수 상한",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        default=os.getenv("EVALUATION_PROFILE", "") not in ("", "0"),
+        help="단계별 시간 측정과 스택 샘플링 켜기 (EVALUATION_PROFILE=1 과 같음)",
+    )
+    parser.add_argument(
+        "--profile-interval",
+        type=float,
+        default=0.005,
+        help="스택 샘플링 간격 (초)",
+    )
+    parser.add_argument("--no-sampling", action="store_true", help="단계별 시간만 측정")
+    args = parser.parse_args()
+
+    recorder = MetricsRecorder(args.run_id, args.metrics_dir, args.budget)
+    backend = backend_from_args(args)
+
+    controller = None
+    if args.adaptive:
+        controller = AIMDController(
+            initial=backend.max_concurrency,
+            maximum=args.max_concurrency,
+            recorder=recorder,
+        )
+        recorder.add_listener(controller.observe)
+
+    # 평가 호출과 조각 요약 호출 모두 한 제한 안에서만 보냄
+    # (자동 조절이면 조절기의 limit, 아니면 백엔드의 max_concurrency 로 고정)
+    backend = InstrumentedBackend(backend, recorder, limiter=controller)
+    if args.hedge:
+        backend = HedgedBackend(
+            backend,
+            recorder,
+            quantile=args.hedge_quantile,
+            max_concurrency=args.max_concurrency if args.adaptive else None,
+        )
+    if args.profile:
+        profiler.start(sample=not args.no_sampling, interval=args.profile_interval)
+
+    with span("load"):
+        forms = list(iter_results(args.input)) if args.input else application_forms
+    print(len(forms))
+    print(f"백엔드: {backend.describe()}")
+
+    monitor = None
+    if not args.no_monitor:
+        monitor = DistributionMonitor(
+            threshold=args.drift_threshold, min_samples=args.drift_min_samples
+        )
+
+    sizes = [estimate_form_tokens(form) for form in forms]
+    order = longest_first(sizes) if args.schedule == "longest" else None
+    observer = LatencyObserver(sizes)
+    recorder.add_listener(observer.observe)
+    latency_model = LatencyModel.load(backend.model)
+
+    start = time.time()
+    failures = []
+    evaluation_results = evaluate_all(
+        forms, backend, monitor, args.drift_action, controller, order, failures
+    )
+    end = time.time()
+    elapsed = end - start
+
+    # 예상 시간 계산에 쓸 동시 요청 수 - 자동 조절이면 끝났을 때 값이 아니라 실행 중 시간 가중 평균
+    if controller is not None:
+        mean_limit = controller.mean_limit(start, end)
+        workers = max(1, round(mean_limit))
+        workers_basis = f"자동 조절 시간 가중 평균 {mean_limit:.1f}"
+    else:
+        workers = backend.max_concurrency
+        workers_basis = "고정"
+
+    fitted = LatencyModel.fit(observer.points)
+    if fitted is not None:
+        fitted.save(backend.model)
+    makespan = makespan_report(
+        sizes,
+        order or range(len(forms)),
+        workers,
+        elapsed,
+        before=latency_model,
+        after=fitted,
+        basis=workers_basis,
+    )
+
+    # 중단되거나 일부가 실패해도 평가된 결과는 저장, 실패 목록은 실행 폴더에 따로 저장
+    with span("write"), open(args.output, "w", encoding="utf-8") as f:
+        json.dump(evaluation_results, f, indent=4, ensure_ascii=False)
+    if failures:
+        failures.sort(key=lambda failure: failure["index"])
+        with open(os.path.join(recorder.directory, "failures.json"), "w") as f:
+            json.dump(failures, f, indent=4, ensure_ascii=False)
+        print(
+            f"평가 실패 {len(failures)}명: {os.path.join(recorder.directory, 'failures.json')}"
+        )
+
+    if args.hedge:
+        backend.close()
+    recorder.print_summary()
+    if controller is not None:
+        summary = controller.summary()
+        print(
+            f"동시 요청 수: 최종 {summary['final']} (범위 {summary['min']}~{summary['max']}, 감소 {summary['decreases']}회)"
+        )
+    print_makespan(makespan)
+    with open(os.path.join(recorder.directory, "makespan.json"), "w") as f:
+        json.dump(makespan, f, indent=4, ensure_ascii=False)
+    recorder.export_json()
+    recorder.export_prometheus()
+    recorder.close()
+    print(f"호출 기록: {recorder.directory}")
+
+    if args.profile:
+        folded = profiler.stop(recorder.directory)
+        profiler.print_summary()
+        if folded:
+            print(
+                f"플레임 그래프용 스택: {folded} (flamegraph.pl 또는 speedscope 로 열기)"
+            )
+
+
+if __name__ == "__main__":
+    main()
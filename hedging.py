@@ -0,0 +1,119 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from backends import LLMBackend
+from metrics import call_context, current_context
+
+
+class HedgedBackend(LLMBackend):
+    # 응답이 최근 지연의 p95 를 넘기면 같은 요청을 한 번 더 보내고 먼저 온 응답을 사용
+    # 늦은 쪽은 결과만 버림 (이미 보낸 요청은 끊을 수 없으므로 비용은 기록에 남음)
+    def __init__(
+        self,
+        inner,
+        recorder=None,
+        quantile=0.95,
+        min_samples=20,
+        window=200,
+        max_concurrency=None,
+    ):
+        # max_concurrency: 동시에 들어올 수 있는 최대 호출 수 (자동 조절이면 조절기 상한)
+        self.inner = inner
+        self.recorder = recorder
+        self.name = f"{inner.name}+hedge"
+        self.model = inner.model
+        self.max_concurrency = inner.max_concurrency
+        self.supports_batching = inner.supports_batching
+        self.quantile = quantile
+        self.min_samples = min_samples
+        self.latencies = deque(maxlen=window)
+        self.lock = threading.Lock()
+        # 원래 요청과 중복 요청이 모두 진행될 수 있으므로 두 배
+        self.executor = ThreadPoolExecutor(
+            max_workers=(max_concurrency or inner.max_concurrency) * 2
+        )
+
+    def hedge_delay(self):
+        with self.lock:
+            if len(self.latencies) < self.min_samples:
+                return None
+            values = sorted(self.latencies)
+        return values[min(len(values) - 1, int(len(values) * self.quantile))]
+
+    def observe(self, latency):
+        with self.lock:
+            self.latencies.append(latency)
+
+    def count(self, key):
+        if self.recorder is not None:
+            self.recorder.increment(key)
+
+    def complete_batch(self, requests, json_mode=True):
+        # 조각 요약은 캐시와 배치로 처리되므로 중복 요청 없이 그대로 전달
+        return self.inner.complete_batch(requests, json_mode)
+
+    def complete(self, messages, json_mode=True):
+        delay = self.hedge_delay()
+        start = time.time()
+        if delay is None:
+            completion = self.inner.complete(messages, json_mode)
+            self.observe(time.time() - start)
+            return completion
+
+        context = current_context()
+        started = {}
+        primary_started = threading.Event()
+
+        def send(role):
+            def on_send():
+                started[role] = time.time()
+                if role == "primary":
+                    primary_started.set()
+
+            # 안쪽 백엔드가 실제로 보낼 때 on_send 를 부름 (부르지 않는 백엔드면 끝난 뒤)
+            try:
+                with call_context(**context, hedge=role, on_send=on_send):
+                    return self.inner.complete(messages, json_mode)
+            finally:
+                if role not in started:
+                    on_send()
+
+        primary = self.executor.submit(send, "primary")
+        # 풀이나 동시 요청 제한에서 기다린 시간은 빼고, 요청이 실제로 나간 시각부터 delay 를 잼
+        primary_started.wait()
+        start = started["primary"]
+        finished, _ = wait([primary], timeout=max(0.0, delay - (time.time() - start)))
+        if finished:
+            completion = primary.result()
+            self.observe(time.time() - start)
+            return completion
+
+        self.count("hedges")
+        hedged_at = time.time()
+        hedge = self.executor.submit(send, "hedge")
+        remaining = {primary, hedge}
+        error = None
+        while remaining:
+            finished, remaining = wait(remaining, return_when=FIRST_COMPLETED)
+            for future in finished:
+                if future.exception() is not None:
+                    # 원래 요청의 오류를 우선 (중복 요청은 예산 초과 등으로 실패할 수 있음)
+                    if future is primary or error is None:
+                        error = future.exception()
+                    continue
+                for loser in remaining:
+                    loser.cancel()
+                # 이긴 요청 자체의 지연만 기준에 넣음 - p95 가 꼬리 쪽으로 끌려가는 것 방지
+                if future is hedge:
+                    self.count("hedge_wins")
+                    self.observe(time.time() - started.get("hedge", hedged_at))
+                else:
+                    self.observe(time.time() - start)
+                return future.result()
+        raise error
+
+    def close(self):
+        # 결과를 버린 늦은 요청까지 끝나야 비용 기록이 빠지지 않음
+        self.executor.shutdown(wait=True)
@@ -0,0 +1,360 @@
+import argparse
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+
+from backends import add_backend_arguments, backend_from_args, parse_user_info
+from metrics import InstrumentedBackend, MetricsRecorder, call_context
+from results_io import applicant_key, iter_results
+
+STATES = ["pending", "leased", "done", "failed"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    lease_until REAL,
+    result TEXT,
+    error TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, lease_until);
+CREATE UNIQUE INDEX IF NOT EXISTS jobs_key ON jobs (key);
+"""
+
+
+def job_key(form):
+    # 지원서(user_info 문자열)와 결과(user_name/user_birth) 모두 같은 지원자 키로
+    if "user_name" not in form:
+        form = {**parse_user_info(form.get("user_info", "")), **form}
+    return applicant_key(form)
+
+
+def default_worker_id():
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class JobQueue:
+    # 지원자 한 명 = 작업 하나. 상태: pending -> leased -> done / failed
+    def __init__(self, path, lease_seconds=300, max_attempts=3, wal=True):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(
+            path, timeout=60, isolation_level=None, check_same_thread=False
+        )
+        # WAL 은 같은 호스트에서만 안전 - 여러 호스트가 네트워크 파일시스템을 공유하면 wal=False
+        self.conn.execute(f"PRAGMA journal_mode={'WAL' if wal else 'DELETE'}")
+        self.conn.executescript(SCHEMA)
+
+    @contextmanager
+    def transaction(self):
+        # 다른 프로세스와 겹치지 않도록 쓰기 잠금을 먼저 잡고 시작
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.conn
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+
+    def enqueue(self, forms):
+        # 지원자 키로 추가/갱신 - (추가, 내용이 바뀌어 다시 대기, 입력 안의 중복) 건수
+        # 이미 있는 지원자는 그대로 두고, 지원서 내용이 바뀐 경우에만 처음부터 다시 평가
+        # id 는 처음 추가된 순서 (merge 결과 순서) - 같은 db 에 다시 init 해도 섞이지 않음
+        now = time.time()
+        rows = {}
+        duplicates = 0
+        for form in forms:
+            key = job_key(form)
+            if key in rows:
+                duplicates += 1
+                continue
+            rows[key] = json.dumps(form, ensure_ascii=False)
+
+        with self.transaction() as conn:
+            existing = {key for (key,) in conn.execute("SELECT key FROM jobs")}
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT INTO jobs (key, payload, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET payload = excluded.payload, "
+                "state = 'pending', attempts = 0, worker = NULL, lease_until = NULL, "
+                "result = NULL, error = NULL, updated_at = excluded.updated_at "
+                "WHERE jobs.payload != excluded.payload",
+                ((key, payload, now) for key, payload in rows.items()),
+            )
+            added = sum(1 for key in rows if key not in existing)
+            changed = conn.total_changes - before - added
+        return added, changed, duplicates
+
+    def requeue_expired(self, conn, now):
+        # 임대 시간이 지난 작업은 작업자가 죽은 것으로 보고 되돌림 (시도 횟수를 다 쓰면 실패 처리)
+        conn.execute(
+            "UPDATE jobs SET state = 'failed', error = 'lease expired', worker = NULL, updated_at = ? "
+            "WHERE state = 'leased' AND lease_until < ? AND attempts >= ?",
+            (now, now, self.max_attempts),
+        )
+        conn.execute(
+            "UPDATE jobs SET state = 'pending', worker = NULL, updated_at = ? "
+            "WHERE state = 'leased' AND lease_until < ?",
+            (now, now),
+        )
+
+    def claim(self, worker, limit):
+        now = time.time()
+        with self.transaction() as conn:
+            self.requeue_expired(conn, now)
+            rows = conn.execute(
+                "SELECT id, payload FROM jobs WHERE state = 'pending' ORDER BY id LIMIT ?",
+                (limit,),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE jobs SET state = 'leased', worker = ?, lease_until = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                [(worker, now + self.lease_seconds, now, i) for i, _ in rows],
+            )
+        return [(i, json.loads(payload)) for i, payload in rows]
+
+    def heartbeat(self, worker, ids):
+        # 처리 중인 작업의 임대 연장
+        now = time.time()
+        with self.transaction() as conn:
+            conn.executemany(
+                "UPDATE jobs SET lease_until = ? WHERE id = ? AND worker = ? AND state = 'leased'",
+                [(now + self.lease_seconds, i, worker) for i in ids],
+            )
+
+    def complete(self, worker, job_id, result):
+        # 임대를 잃은 작업자(다른 작업자가 다시 가져간 경우)의 결과는 무시 - False 반환
+        with self.transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET state = 'done', result = ?, error = NULL, worker = NULL, "
+                "lease_until = NULL, updated_at = ? WHERE id = ? AND worker = ? AND state = 'leased'",
+                (json.dumps(result, ensure_ascii=False), time.time(), job_id, worker),
+            )
+            return cursor.rowcount == 1
+
+    def fail(self, worker, job_id, error):
+        with self.transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "error = ?, worker = NULL, lease_until = NULL, updated_at = ? "
+                "WHERE id = ? AND worker = ? AND state = 'leased'",
+                (self.max_attempts, error, time.time(), job_id, worker),
+            )
+
+    def retry_failed(self):
+        with self.transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET state = 'pending', attempts = 0, updated_at = ? WHERE state = 'failed'",
+                (time.time(),),
+            )
+            return cursor.rowcount
+
+    def stats(self):
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT state, COUNT(*) FROM jobs GROUP BY state"
+            ).fetchall()
+        counts = {state: 0 for state in STATES}
+        counts.update(dict(rows))
+        return counts
+
+    def failures(self):
+        with self.lock:
+            return self.conn.execute(
+                "SELECT id, key, attempts, error FROM jobs WHERE state = 'failed' ORDER BY id"
+            ).fetchall()
+
+    def results(self):
+        # 입력 순서대로 완료된 결과
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT result FROM jobs WHERE state = 'done' ORDER BY id"
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+class Heartbeat:
+    # 임대 시간의 1/3 마다 처리 중인 작업의 임대를 연장하는 스레드
+    def __init__(self, queue, worker):
+        self.queue = queue
+        self.worker = worker
+        self.ids = set()
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def run(self):
+        while not self.stop_event.wait(self.queue.lease_seconds / 3):
+            with self.lock:
+                ids = list(self.ids)
+            if ids:
+                self.queue.heartbeat(self.worker, ids)
+
+    def add(self, job_id):
+        with self.lock:
+            self.ids.add(job_id)
+
+    def discard(self, job_id):
+        with self.lock:
+            self.ids.discard(job_id)
+
+    def stop(self):
+        self.stop_event.set()
+        self.thread.join()
+
+
+def run_worker(queue, backend, worker, poll=2.0):
+    from evaluation import evaluate_application
+
+    heartbeat = Heartbeat(queue, worker)
+    done = failed = 0
+
+    def evaluate(job_id, form):
+        with call_context(applicant=job_id):
+            return evaluate_application(form, backend)
+
+    in_flight = {}
+    try:
+        with ThreadPoolExecutor(max_workers=backend.max_concurrency) as executor:
+            while True:
+                # 빈 자리만큼만 가져옴 - 하나가 끝나면 바로 다음 작업을 임대
+                free = backend.max_concurrency - len(in_flight)
+                for job_id, form in queue.claim(worker, free) if free else []:
+                    heartbeat.add(job_id)
+                    in_flight[executor.submit(evaluate, job_id, form)] = job_id
+
+                if not in_flight:
+                    counts = queue.stats()
+                    # 다른 작업자가 처리 중인 작업이 남아 있으면 임대가 끝날 수 있으니 기다림
+                    if counts["pending"] == 0 and counts["leased"] == 0:
+                        break
+                    time.sleep(poll)
+                    continue
+
+                finished, _ = wait(in_flight, timeout=poll, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    job_id = in_flight.pop(future)
+                    heartbeat.discard(job_id)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        queue.fail(worker, job_id, f"{type(e).__name__}: {e}")
+                        failed += 1
+                        print(f"[{worker}] {job_id}번 실패: {e}")
+                        continue
+                    if queue.complete(worker, job_id, result):
+                        done += 1
+                        print(f"[{worker}] {job_id}번 완료 (이 작업자 {done}건)")
+    finally:
+        heartbeat.stop()
+    return done, failed
+
+
+def merge(queue, output):
+    results = queue.results()
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=4, ensure_ascii=False)
+    return results
+
+
+def print_status(queue):
+    counts = queue.stats()
+    total = sum(counts.values())
+    print(
+        f"전체 {total}건: " + ", ".join(f"{state} {counts[state]}" for state in STATES)
+    )
+    for job_id, key, attempts, error in queue.failures():
+        print(f"  실패 {job_id} {key} (시도 {attempts}회): {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="여러 작업자가 나눠 처리하는 평가 작업 대기열"
+    )
+    parser.add_argument("db", help="대기열 SQLite 파일")
+    parser.add_argument(
+        "--no-wal",
+        action="store_true",
+        help="네트워크 파일시스템을 여러 호스트가 공유할 때 사용",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    init = commands.add_parser("init", help="지원서를 대기열에 추가")
+    init.add_argument(
+        "--input", help="지원서 파일 (.json/.jsonl, 없으면 application_forms)"
+    )
+
+    work = commands.add_parser("work", help="대기열이 빌 때까지 평가")
+    add_backend_arguments(work)
+    work.add_argument("--worker-id", default=default_worker_id())
+    work.add_argument("--lease", type=float, default=300, help="임대 시간 (초)")
+    work.add_argument("--max-attempts", type=int, default=3)
+    work.add_argument("--metrics-dir", default="runs")
+
+    merge_parser = commands.add_parser("merge", help="완료된 결과를 입력 순서대로 저장")
+    merge_parser.add_argument(
+        "--output", default="evaluation_results_enhanced_ver2.json"
+    )
+
+    commands.add_parser("status", help="상태별 작업 수")
+    commands.add_parser("retry", help="실패한 작업을 다시 대기열로")
+    args = parser.parse_args()
+
+    queue = JobQueue(
+        args.db,
+        lease_seconds=getattr(args, "lease", 300),
+        max_attempts=getattr(args, "max_attempts", 3),
+        wal=not args.no_wal,
+    )
+
+    if args.command == "init":
+        if args.input:
+            forms = iter_results(args.input)
+        else:
+            from evaluation import application_forms as forms
+        added, changed, duplicates = queue.enqueue(forms)
+        print(f"{added}건 추가, 내용이 바뀐 {changed}건 다시 대기")
+        if duplicates:
+            print(f"입력 안에서 같은 지원자(이름+생년월일) {duplicates}건은 건너뜀")
+        print_status(queue)
+    elif args.command == "work":
+        recorder = MetricsRecorder(args.worker_id, args.metrics_dir)
+        backend = InstrumentedBackend(backend_from_args(args), recorder)
+        print(f"작업자 {args.worker_id}, 백엔드: {backend.describe()}")
+        done, failed = run_worker(queue, backend, args.worker_id)
+        print(f"작업자 {args.worker_id}: 완료 {done}, 실패 {failed}")
+        recorder.print_summary()
+        recorder.export_json()
+        recorder.close()
+    elif args.command == "merge":
+        print_status(queue)
+        results = merge(queue, args.output)
+        print(f"{len(results)}건을 {args.output}에 저장")
+    elif args.command == "status":
+        print_status(queue)
+    elif args.command == "retry":
+        print(f"{queue.retry_failed()}건 다시 대기")
+
+    queue.close()
+
+
+if __name__ == "__main__":
+    main()
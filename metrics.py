@@ -0,0 +1,365 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+
+from backends import LLMBackend, estimate_tokens
+from concurrency import FixedLimit
+
+# 1M 토큰당 USD 가격
+PRICES = {
+    "gpt-4o": {"input": 2.50, "cached_input": 1.25, "output": 10.00},
+    "gpt-4o-mini": {"input": 0.15, "cached_input": 0.075, "output": 0.60},
+}
+
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 32, 64)
+
+TOKEN_BUCKETS = (250, 500, 1000, 2000, 4000, 8000, 16000, 32000)
+
+# 아직 완료된 호출이 없을 때 예산 계산에 쓰는 응답 토큰 수 (평가 JSON 한 건보다 넉넉하게)
+DEFAULT_COMPLETION_TOKENS = 1000
+
+
+class BudgetExceeded(Exception):
+    pass
+
+
+def price_for(model):
+    # "gpt-4o-2024-08-06" 처럼 날짜가 붙은 모델명도 기본 모델 가격으로 계산
+    for name in sorted(PRICES, key=len, reverse=True):
+        if model == name or model.startswith(f"{name}-"):
+            return PRICES[name]
+    return None
+
+
+def call_cost(model, usage):
+    price = price_for(model or "")
+    if price is None or not usage:
+        return 0.0
+    cached = usage.get("cached_tokens", 0)
+    prompt = usage.get("prompt_tokens", 0) - cached
+    return (
+        prompt * price["input"]
+        + cached * price["cached_input"]
+        + usage.get("completion_tokens", 0) * price["output"]
+    ) / 1_000_000
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        total = 0
+        result = []
+        for bound, count in zip(list(self.buckets) + ["+Inf"], self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def to_dict(self):
+        return {
+            "buckets": {str(bound): count for bound, count in self.cumulative()},
+            "sum": self.sum,
+            "count": self.count,
+        }
+
+
+_context = threading.local()
+
+
+@contextmanager
+def call_context(**values):
+    # 현재 스레드에서 이루어지는 호출에 붙일 정보 (지원자 번호, 대기열 진입 시각 등)
+    previous = getattr(_context, "values", {})
+    _context.values = {**previous, **values}
+    try:
+        yield
+    finally:
+        _context.values = previous
+
+
+def current_context():
+    return getattr(_context, "values", {})
+
+
+class MetricsRecorder:
+    def __init__(self, run_id=None, directory="runs", budget=None):
+        self.run_id = run_id or datetime.now().strftime("%Y%m%d-%H%M%S")
+        self.directory = os.path.join(directory, self.run_id)
+        os.makedirs(self.directory, exist_ok=True)
+        self.budget = budget
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.reserved = 0.0
+        self.ledger = open(
+            os.path.join(self.directory, "ledger.jsonl"), "a", encoding="utf-8"
+        )
+
+        self.histograms = {
+            "queue_wait_seconds": Histogram(LATENCY_BUCKETS),
+            "request_latency_seconds": Histogram(LATENCY_BUCKETS),
+            "prompt_tokens": Histogram(TOKEN_BUCKETS),
+            "completion_tokens": Histogram(TOKEN_BUCKETS),
+        }
+        self.listeners = []
+        self.gauges = {}
+        self.gauge_history = []
+        self.totals = {
+            "calls": 0,
+            "errors": 0,
+            "retries": 0,
+            "throttled": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "cached_tokens": 0,
+            "cost_usd": 0.0,
+            "hedges": 0,
+            "hedge_wins": 0,
+            "hedge_cost_usd": 0.0,
+        }
+
+    def estimate_cost(self, model, messages):
+        # 호출 전에 예상하는 비용 - 입력은 메시지 길이로, 응답은 지금까지의 평균(없으면 기본값)으로
+        price = price_for(model or "")
+        if price is None:
+            return 0.0
+        prompt = estimate_tokens(json.dumps(messages, ensure_ascii=False))
+        with self.lock:
+            calls = self.totals["calls"]
+            completion = (
+                self.totals["completion_tokens"] / calls
+                if calls
+                else DEFAULT_COMPLETION_TOKENS
+            )
+        return (prompt * price["input"] + completion * price["output"]) / 1_000_000
+
+    def check_budget(self, estimate=0.0):
+        # 사용한 비용 + 진행 중인 호출의 예상 비용 + 이번 호출의 예상 비용이 예산 안인지 확인
+        # 넘을 것 같으면 호출 전에 중단, 통과하면 예상 비용을 잡아 두었다가 record 에서 풂
+        with self.lock:
+            spent = self.totals["cost_usd"]
+            projected = spent + self.reserved + estimate
+            if self.budget is None or projected <= self.budget:
+                self.in_flight += 1
+                self.reserved += estimate
+                return estimate
+        raise BudgetExceeded(
+            f"예산 ${self.budget:.2f} 초과 예상 (사용 ${spent:.4f}, 진행 중 {self.in_flight}건 ${self.reserved:.4f}, 이번 호출 ${estimate:.4f})"
+        )
+
+    def record(self, entry, reserved=0.0):
+        # reserved: check_budget 에서 잡아 둔 예상 비용 (실제 비용으로 대체)
+        entry = {"run_id": self.run_id, "timestamp": time.time(), **entry}
+        usage = entry.get("usage") or {}
+        entry["cost_usd"] = call_cost(entry.get("model"), usage)
+
+        with self.lock:
+            self.in_flight = max(0, self.in_flight - 1)
+            self.reserved = max(0.0, self.reserved - reserved)
+            self.totals["calls"] += 1
+            self.totals["errors"] += 1 if entry.get("error") else 0
+            self.totals["retries"] += entry.get("retries", 0)
+            self.totals["throttled"] += entry.get("throttled", 0)
+            self.totals["cost_usd"] += entry["cost_usd"]
+            if entry.get("hedge") == "hedge":
+                self.totals["hedge_cost_usd"] += entry["cost_usd"]
+            for key in ["prompt_tokens", "completion_tokens", "cached_tokens"]:
+                self.totals[key] += usage.get(key, 0)
+
+            self.histograms["queue_wait_seconds"].observe(entry.get("queue_wait", 0.0))
+            self.histograms["request_latency_seconds"].observe(entry["latency"])
+            if usage:
+                self.histograms["prompt_tokens"].observe(usage.get("prompt_tokens", 0))
+                self.histograms["completion_tokens"].observe(
+                    usage.get("completion_tokens", 0)
+                )
+
+            # 실행이 중간에 끊겨도 남도록 호출마다 바로 기록
+            self.ledger.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self.ledger.flush()
+
+        for listener in self.listeners:
+            listener(entry)
+
+    def add_listener(self, listener):
+        # 호출 기록마다 불리는 함수 (예: 동시 요청 수 조절기)
+        self.listeners.append(listener)
+
+    def increment(self, key, value=1):
+        with self.lock:
+            self.totals[key] += value
+
+    def set_gauge(self, name, value, reason=None):
+        with self.lock:
+            self.gauges[name] = value
+            self.gauge_history.append(
+                {"time": time.time(), "name": name, "value": value, "reason": reason}
+            )
+
+    def summary(self):
+        with self.lock:
+            return {
+                "run_id": self.run_id,
+                "budget_usd": self.budget,
+                "totals": dict(self.totals),
+                "gauges": dict(self.gauges),
+                "gauge_history": list(self.gauge_history),
+                "histograms": {
+                    name: histogram.to_dict()
+                    for name, histogram in self.histograms.items()
+                },
+            }
+
+    def export_json(self, path=None):
+        path = path or os.path.join(self.directory, "metrics.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=4, ensure_ascii=False)
+        return path
+
+    def export_prometheus(self, path=None):
+        # node_exporter textfile collector 형식
+        path = path or os.path.join(self.directory, "metrics.prom")
+        summary = self.summary()
+        label = f'run_id="{self.run_id}"'
+        lines = []
+
+        for name, histogram in self.histograms.items():
+            metric = f"evaluation_llm_{name}"
+            lines.append(f"# TYPE {metric} histogram")
+            for bound, count in histogram.cumulative():
+                lines.append(f'{metric}_bucket{{{label},le="{bound}"}} {count}')
+            lines.append(f"{metric}_sum{{{label}}} {histogram.sum}")
+            lines.append(f"{metric}_count{{{label}}} {histogram.count}")
+
+        for key, value in summary["totals"].items():
+            metric = f"evaluation_llm_{key}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric}{{{label}}} {value}")
+
+        for name, value in summary["gauges"].items():
+            metric = f"evaluation_llm_{name}"
+            lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"{metric}{{{label}}} {value}")
+
+        if self.budget is not None:
+            lines.append("# TYPE evaluation_llm_budget_usd gauge")
+            lines.append(f"evaluation_llm_budget_usd{{{label}}} {self.budget}")
+
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        return path
+
+    def print_summary(self):
+        totals = self.summary()["totals"]
+        latency = self.histograms["request_latency_seconds"]
+        mean = latency.sum / latency.count if latency.count else 0.0
+        print(
+            f"호출 {totals['calls']}건 (오류 {totals['errors']}, 재시도 {totals['retries']}, 429 {totals['throttled']}), "
+            f"평균 지연 {mean:.2f}초, 토큰 {totals['prompt_tokens']}+{totals['completion_tokens']} "
+            f"(캐시 {totals['cached_tokens']}), 비용 ${totals['cost_usd']:.4f}"
+        )
+        if totals["hedges"]:
+            print(
+                f"중복 요청 {totals['hedges']}건 (먼저 도착 {totals['hedge_wins']}건), 추가 비용 ${totals['hedge_cost_usd']:.4f}"
+            )
+
+    def close(self):
+        with self.lock:
+            self.ledger.close()
+
+
+class InstrumentedBackend(LLMBackend):
+    # 모든 모델 호출을 측정해서 MetricsRecorder 에 기록하는 래퍼
+    def __init__(self, inner, recorder, limiter=None):
+        # limiter: slot() 을 가진 동시 요청 제한 (AIMDController) - 조각 요약 호출도 같은 제한을 받음
+        # 없으면 백엔드의 max_concurrency 로 고정 (지원자마다 조각 요약 풀을 따로 열어도 합계는 이 안)
+        self.inner = inner
+        self.recorder = recorder
+        self.limiter = (
+            limiter if limiter is not None else FixedLimit(inner.max_concurrency)
+        )
+        self.name = inner.name
+        self.model = inner.model
+        self.max_concurrency = inner.max_concurrency
+        self.supports_batching = inner.supports_batching
+
+    def complete_batch(self, requests, json_mode=True):
+        # 작업 스레드에서도 호출한 쪽의 정보(단계, 지원자 번호)가 기록되도록 전달
+        context = current_context()
+
+        queued_at = time.time()
+
+        def complete(messages):
+            # 조각마다 이 배치에서 기다린 시간 (지원자 단위 대기 시간 대신)
+            with call_context(**context, queued_at=queued_at):
+                return self.complete(messages, json_mode)
+
+        workers = max(1, min(len(requests), self.max_concurrency))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(complete, requests))
+
+    def complete(self, messages, json_mode=True):
+        with self.limiter.slot():
+            return self.send(messages, json_mode)
+
+    def send(self, messages, json_mode):
+        reserved = self.recorder.check_budget(
+            self.recorder.estimate_cost(self.model, messages)
+        )
+        context = current_context()
+        start = time.time()
+        # 자리를 기다린 뒤 실제로 보내는 시점을 알림 (HedgedBackend 의 중복 요청 기준 시각)
+        if "on_send" in context:
+            context["on_send"]()
+        # queued_at: 이 호출이 풀에 들어간 시각, queue_wait: 지원자가 작업자를 기다린 시간
+        if "queued_at" in context:
+            queue_wait = start - context["queued_at"]
+        else:
+            queue_wait = context.get("queue_wait", 0.0)
+        entry = {
+            "applicant": context.get("applicant"),
+            "stage": context.get("stage", "evaluate"),
+            "hedge": context.get("hedge"),
+            "queue_wait": queue_wait,
+            "model": self.model,
+        }
+        try:
+            completion = self.inner.complete(messages, json_mode)
+        except Exception as e:
+            entry["latency"] = time.time() - start
+            entry["error"] = f"{type(e).__name__}: {e}"
+            entry["retries"] = getattr(e, "retries", 0)
+            # 429 로 재시도를 다 쓴 경우에도 받은 429 수를 남김 (OpenAIBackend 가 예외에 기록)
+            entry["throttled"] = getattr(e, "throttled", 0)
+            self.recorder.record(entry, reserved)
+            raise
+
+        entry.update(
+            {
+                "latency": time.time() - start,
+                "model": completion.model or self.model,
+                "usage": completion.usage,
+                "retries": completion.retries,
+                "throttled": completion.throttled,
+                "request_id": completion.headers.get("x-request-id"),
+            }
+        )
+        self.recorder.record(entry, reserved)
+        return completion
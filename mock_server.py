@@ -0,0 +1,191 @@
+import argparse
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from backends import estimate_tokens, mock_response
+
+
+def parse_latency(spec):
+    # "fixed:0.5", "uniform:0.2,1.0", "lognormal:0.8,0.5" (중앙값 초, 표준편차) -> 지연 샘플 함수
+    kind, _, params = spec.partition(":")
+    values = [float(v) for v in params.split(",") if v]
+    if kind == "fixed":
+        return lambda rng: values[0] if values else 0.0
+    if kind == "uniform":
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == "lognormal":
+        mu = math.log(values[0])
+        return lambda rng: rng.lognormvariate(mu, values[1])
+    raise ValueError(f"지원하지 않는 지연 분포입니다: {spec}")
+
+
+class MockChatServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(
+        self,
+        address=("127.0.0.1", 0),
+        latency="fixed:0",
+        error_rate=0.0,
+        response_chars=0,
+        seed=0,
+        token_latency=0.0,
+    ):
+        super().__init__(address, MockChatHandler)
+        self.token_latency = token_latency
+        self.sample_latency = parse_latency(latency)
+        self.error_rate = error_rate
+        self.response_chars = response_chars
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.throttled = 0
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def draw(self):
+        # 여러 스레드가 같은 난수 생성기를 쓰므로 잠금 후 샘플링
+        with self.lock:
+            self.requests += 1
+            throttle = self.rng.random() < self.error_rate
+            if throttle:
+                self.throttled += 1
+            return throttle, self.sample_latency(self.rng)
+
+
+class MockChatHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, body, headers=None):
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self.send_json(404, {"error": {"message": "not found"}})
+            return
+
+        request = json.loads(body)
+        throttle, latency = self.server.draw()
+        if throttle:
+            self.send_json(
+                429,
+                {"error": {"message": "Rate limit reached", "type": "requests"}},
+                {"retry-after-ms": "50", "x-ratelimit-remaining-requests": "0"},
+            )
+            return
+
+        messages = request["messages"]
+        prompt = "".join(m["content"] for m in messages)
+        # 긴 요청일수록 느리게 - 1000 토큰당 token_latency 초 추가
+        time.sleep(latency + self.server.token_latency * estimate_tokens(prompt) / 1000)
+        seed = int.from_bytes(hashlib.sha256(body).digest()[:4], "big")
+        result = mock_response(messages, random.Random(seed))
+        # 응답 크기 조절 - 설명 필드를 채워 원하는 글자 수에 맞춤
+        if self.server.response_chars and "evaluation_result" in result:
+            for data in result["evaluation_result"].values():
+                for key in data:
+                    if key.endswith("_explanation"):
+                        data[key] = "가" * (self.server.response_chars // 4)
+        content = json.dumps(result, ensure_ascii=False)
+
+        self.send_json(
+            200,
+            {
+                "id": f"chatcmpl-mock-{seed:x}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request.get("model", "mock"),
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": estimate_tokens(prompt),
+                    "completion_tokens": estimate_tokens(content),
+                    "total_tokens": estimate_tokens(prompt) + estimate_tokens(content),
+                    "prompt_tokens_details": {"cached_tokens": 0},
+                },
+            },
+            {"x-ratelimit-remaining-requests": "10000"},
+        )
+
+
+def start_server(**kwargs):
+    # 백그라운드 스레드에서 실행 - 테스트와 벤치마크에서 사용
+    server = MockChatServer(**kwargs)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def add_server_arguments(parser):
+    parser.add_argument(
+        "--latency",
+        default="lognormal:0.05,0.5",
+        help="응답 지연 분포 (fixed:초, uniform:최소,최대, lognormal:중앙값,시그마)",
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="429 응답 비율 (0~1)"
+    )
+    parser.add_argument(
+        "--response-chars", type=int, default=0, help="응답 설명 필드 글자 수"
+    )
+    parser.add_argument(
+        "--token-latency",
+        type=float,
+        default=0.0,
+        help="요청 1000 토큰당 추가 지연 (초)",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 chat completions 모의 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    server = MockChatServer(
+        (args.host, args.port),
+        latency=args.latency,
+        error_rate=args.error_rate,
+        response_chars=args.response_chars,
+        seed=args.seed,
+        token_latency=args.token_latency,
+    )
+    print(f"모의 서버 실행 중: {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"요청 {server.requests}건 (429 {server.throttled}건)")
+
+
+if __name__ == "__main__":
+    main()
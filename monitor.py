@@ -0,0 +1,99 @@
+import math
+from collections import Counter
+
+# 평가 기준표(SYSTEM_PROMPT)에서 제시한 목표 비율
+TARGET_QUOTAS = {
+    "지원 동기 및 진정성": {"A": 0.085, "B": 0.515, "C": 0.40},
+    "논리적 표현력": {"A": 0.085, "B": 0.515, "C": 0.40},
+    "활동경험": {"G": 0.03, "NP": 0.97},
+}
+
+DRIFT_ACTIONS = ["warn", "pause", "halt"]
+
+
+def wilson_interval(count, n, z=1.96):
+    # 표본이 적을 때도 0~1 범위를 벗어나지 않는 이항 비율 신뢰구간
+    if n == 0:
+        return 0.0, 1.0
+    p = count / n
+    denom = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denom
+    margin = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+
+class DistributionMonitor:
+    def __init__(self, quotas=TARGET_QUOTAS, threshold=0.15, min_samples=10, z=1.96):
+        self.quotas = quotas
+        self.threshold = threshold
+        self.min_samples = min_samples
+        self.z = z
+        self.counts = {category: Counter() for category in quotas}
+        self.totals = Counter()
+        # 이미 알린 (항목, 점수) - 같은 경보를 매번 반복하지 않기 위함
+        self.alerting = set()
+
+    def update(self, result):
+        for category, data in result.get("evaluation_result", {}).items():
+            if category in self.counts and "score" in data:
+                self.counts[category][data["score"]] += 1
+                self.totals[category] += 1
+        return self.check()
+
+    def stats(self):
+        rows = []
+        for category, targets in self.quotas.items():
+            n = self.totals[category]
+            for score, target in targets.items():
+                count = self.counts[category][score]
+                low, high = wilson_interval(count, n, self.z)
+                rows.append(
+                    {
+                        "category": category,
+                        "score": score,
+                        "n": n,
+                        "ratio": (count / n if n else 0.0),
+                        "target": target,
+                        "ci": (low, high),
+                    }
+                )
+        return rows
+
+    def check(self):
+        # 목표 비율이 신뢰구간 밖에 있고 차이가 임계값을 넘으면 새 경보로 반환
+        alerts = []
+        drifting = set()
+        for row in self.stats():
+            if row["n"] < self.min_samples:
+                continue
+            low, high = row["ci"]
+            outside = row["target"] < low or row["target"] > high
+            if outside and abs(row["ratio"] - row["target"]) > self.threshold:
+                key = (row["category"], row["score"])
+                drifting.add(key)
+                if key not in self.alerting:
+                    alerts.append(row)
+        self.alerting = drifting
+        return alerts
+
+    def summary(self):
+        parts = []
+        for category in self.quotas:
+            n = self.totals[category]
+            if not n:
+                continue
+            scores = " ".join(
+                f"{row['score']} {row['ratio']:.0%}"
+                for row in self.stats()
+                if row["category"] == category
+            )
+            parts.append(f"{category}: {scores}")
+        return " | ".join(parts)
+
+
+def format_alert(row):
+    low, high = row["ci"]
+    return (
+        f"[분포 경고] {row['category']} {row['score']}: {row['ratio']:.1%} "
+        f"(95% CI {low:.1%}~{high:.1%}, 목표 {row['target']:.1%}, n={row['n']})"
+    )
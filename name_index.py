@@ -0,0 +1,184 @@
+from bisect import bisect_left
+
+HANGUL_START = 0xAC00
+HANGUL_END = 0xD7A3
+
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSEONG = " ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ"
+
+# 겹모음/겹받침은 입력 도중 상태와 맞도록 낱자로 풀어서 비교 ("김ㅁ" -> "김민" 앞부분)
+COMPOUND = {
+    "ㅘ": "ㅗㅏ",
+    "ㅙ": "ㅗㅐ",
+    "ㅚ": "ㅗㅣ",
+    "ㅝ": "ㅜㅓ",
+    "ㅞ": "ㅜㅔ",
+    "ㅟ": "ㅜㅣ",
+    "ㅢ": "ㅡㅣ",
+    "ㄳ": "ㄱㅅ",
+    "ㄵ": "ㄴㅈ",
+    "ㄶ": "ㄴㅎ",
+    "ㄺ": "ㄹㄱ",
+    "ㄻ": "ㄹㅁ",
+    "ㄼ": "ㄹㅂ",
+    "ㄽ": "ㄹㅅ",
+    "ㄾ": "ㄹㅌ",
+    "ㄿ": "ㄹㅍ",
+    "ㅀ": "ㄹㅎ",
+    "ㅄ": "ㅂㅅ",
+}
+
+DEFAULT_MAX_DISTANCE = 2
+
+
+def decompose(text):
+    # 음절을 자모로 분해 ("김민" -> "ㄱㅣㅁㅁㅣㄴ"), 한글이 아닌 글자는 소문자로 그대로
+    result = []
+    for char in text.strip().lower():
+        code = ord(char) - HANGUL_START
+        if 0 <= code <= HANGUL_END - HANGUL_START:
+            jamo = CHOSEONG[code // 588] + JUNGSEONG[code % 588 // 28]
+            if code % 28:
+                jamo += JONGSEONG[code % 28]
+        else:
+            jamo = char
+        result.append("".join(COMPOUND.get(j, j) for j in jamo))
+    return "".join(result)
+
+
+def choseong(text):
+    # 초성만 ("김민서" -> "ㄱㅁㅅ"), 한글이 아닌 글자는 그대로
+    result = []
+    for char in text.strip().lower():
+        code = ord(char) - HANGUL_START
+        if 0 <= code <= HANGUL_END - HANGUL_START:
+            result.append(CHOSEONG[code // 588])
+        else:
+            result.append(char)
+    return "".join(result)
+
+
+def is_choseong_query(text):
+    text = text.strip()
+    return bool(text) and all(char in CHOSEONG for char in text)
+
+
+def edit_distance(a, b):
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (char_a != char_b),
+                )
+            )
+        previous = current
+    return previous[-1]
+
+
+def deletions(text):
+    # (음절 하나를 뺀 문자열, 뺀 위치) - 자기 자신은 위치 -1, 오타 후보를 찾는 대칭 삭제 색인의 키
+    return [(text, -1)] + [(text[:i] + text[i + 1 :], i) for i in range(len(text))]
+
+
+class NameIndex:
+    # 데이터셋마다 한 번 만드는 이름 색인 - 결과는 names 안의 위치
+    def __init__(self, names):
+        self.names = list(names)
+        self.positions = {}
+        for i, name in enumerate(self.names):
+            self.positions.setdefault((name or "").strip(), []).append(i)
+
+        # 이름 전체와 음절 단위 접미사(이름 중간부터 검색, "민서" -> "강민서")를 따로 정렬
+        self.full = []
+        self.middle = []
+        self.full_initials = []
+        self.middle_initials = []
+        self.neighbors = {}
+        for name in self.positions:
+            self.full.append((decompose(name), name))
+            self.full_initials.append((choseong(name), name))
+            for start in range(1, len(name)):
+                self.middle.append((decompose(name[start:]), name))
+                self.middle_initials.append((choseong(name[start:]), name))
+            for key, position in deletions(name):
+                self.neighbors.setdefault(key, []).append((name, position))
+        for entries in [
+            self.full,
+            self.middle,
+            self.full_initials,
+            self.middle_initials,
+        ]:
+            entries.sort()
+
+    @staticmethod
+    def prefix_lookup(entries, prefix, found, limit):
+        # 정렬된 목록에서 prefix 로 시작하는 구간만 읽음 (limit 이 None 이면 전부)
+        for position in range(bisect_left(entries, (prefix,)), len(entries)):
+            key, name = entries[position]
+            if limit is not None and len(found) >= limit:
+                break
+            if not key.startswith(prefix):
+                break
+            found.setdefault(name, None)
+
+    def lookup(self, full, middle, prefix, limit):
+        # 앞부분 일치(완전 일치가 가장 앞) -> 중간 일치 순서
+        found = {}
+        self.prefix_lookup(full, prefix, found, limit)
+        self.prefix_lookup(middle, prefix, found, limit)
+        return list(found)
+
+    def prefix(self, query, limit):
+        return self.lookup(self.full, self.middle, decompose(query), limit)
+
+    def choseong(self, query, limit):
+        return self.lookup(
+            self.full_initials, self.middle_initials, query.strip(), limit
+        )
+
+    def fuzzy(self, query, max_distance, limit):
+        # 음절 하나까지 다른 이름 중, 다른 음절의 자모 편집 거리가 max_distance 이하인 것 (가까운 순)
+        query = query.strip()
+        best = {}
+        for key, position in deletions(query):
+            for name, name_position in self.neighbors.get(key, []):
+                if position == name_position:
+                    # 같은 자리의 음절이 다름 (위치 -1 이면 완전 일치)
+                    distance = (
+                        0
+                        if position < 0
+                        else edit_distance(
+                            decompose(query[position]), decompose(name[position])
+                        )
+                    )
+                elif position < 0:
+                    # 이름에 음절 하나가 더 있음
+                    distance = len(decompose(name[name_position]))
+                elif name_position < 0:
+                    # 검색어에 음절 하나가 더 있음
+                    distance = len(decompose(query[position]))
+                else:
+                    continue
+                if distance <= max_distance:
+                    best[name] = min(distance, best.get(name, distance))
+        ranked = sorted(best, key=lambda name: (best[name], name))
+        return ranked if limit is None else ranked[:limit]
+
+    def search(self, query, max_distance=DEFAULT_MAX_DISTANCE, limit=100):
+        # (위치 목록, 방식) - 일치하는 이름이 없을 때만 비슷한 이름(오타 허용)으로 찾음
+        # limit 은 서로 다른 이름 수 기준, None 이면 일치하는 이름 전부
+        query = query.strip()
+        if not query:
+            return [], "none"
+        if is_choseong_query(query):
+            names, mode = self.choseong(query, limit), "choseong"
+        else:
+            names, mode = self.prefix(query, limit), "prefix"
+        if not names:
+            names, mode = self.fuzzy(query, max_distance, limit), "fuzzy"
+        return [i for name in names for i in self.positions[name]], mode
@@ -0,0 +1,145 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+DEFAULT_INTERVAL = 0.005
+
+
+class StageTimer:
+    # 단계별 소요 시간 누적 (여러 스레드에서 동시에 기록)
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.durations = defaultdict(list)
+        self.started = time.perf_counter()
+
+    @contextmanager
+    def span(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self.lock:
+                self.durations[name].append(elapsed)
+
+    def rows(self):
+        with self.lock:
+            items = {name: sorted(values) for name, values in self.durations.items()}
+        rows = []
+        for name, values in items.items():
+            rows.append(
+                {
+                    "stage": name,
+                    "calls": len(values),
+                    "total": sum(values),
+                    "mean": sum(values) / len(values),
+                    "p95": values[min(len(values) - 1, int(len(values) * 0.95))],
+                    "max": values[-1],
+                }
+            )
+        return sorted(rows, key=lambda row: row["total"], reverse=True)
+
+
+class SamplingProfiler:
+    # 일정 간격으로 모든 스레드의 호출 스택을 수집 - 결과는 flamegraph.pl / speedscope 의 folded 형식
+    def __init__(self, interval=DEFAULT_INTERVAL):
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        self.thread.join()
+
+    def run(self):
+        own = threading.get_ident()
+        names = {}
+        while not self.stop_event.wait(self.interval):
+            for thread in threading.enumerate():
+                names[thread.ident] = thread.name
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                # 스레드 풀 작업자는 이름 뒤 번호를 빼고 하나로 묶음
+                root = names.get(ident, "thread").rsplit("_", 1)[0]
+                self.stacks[";".join([root] + stack[::-1])] += 1
+            self.samples += 1
+
+    def write_folded(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        return path
+
+
+class Profiler:
+    def __init__(self):
+        self.enabled = False
+        self.timer = None
+        self.sampler = None
+
+    def start(self, sample=True, interval=DEFAULT_INTERVAL):
+        self.enabled = True
+        self.timer = StageTimer()
+        if sample:
+            self.sampler = SamplingProfiler(interval)
+            self.sampler.start()
+
+    @contextmanager
+    def span(self, name):
+        # 꺼져 있으면 측정하지 않음
+        if not self.enabled:
+            yield
+            return
+        with self.timer.span(name):
+            yield
+
+    def stop(self, directory="."):
+        # 샘플러를 멈추고 folded 스택 파일 경로를 반환
+        if not self.enabled:
+            return None
+        self.enabled = False
+        if self.sampler is None:
+            return None
+        self.sampler.stop()
+        return self.sampler.write_folded(os.path.join(directory, "profile.folded"))
+
+    def print_summary(self):
+        if self.timer is None:
+            return
+        wall = time.perf_counter() - self.timer.started
+        print(
+            f"\n단계별 소요 시간 (전체 {wall:.2f}초, 동시 실행 단계는 합계가 전체보다 클 수 있음)"
+        )
+        print(
+            f"{'단계':<10} {'횟수':>7} {'합계(초)':>10} {'평균(ms)':>10} {'p95(ms)':>10} {'최대(ms)':>10}"
+        )
+        for row in self.timer.rows():
+            print(
+                f"{row['stage']:<10} {row['calls']:>7} {row['total']:>10.2f} "
+                f"{row['mean'] * 1000:>10.1f} {row['p95'] * 1000:>10.1f} {row['max'] * 1000:>10.1f}"
+            )
+        if self.sampler is not None:
+            print(
+                f"스택 샘플 {self.sampler.samples}회 ({self.sampler.interval * 1000:.0f}ms 간격)"
+            )
+
+
+profiler = Profiler()
+
+
+def span(name):
+    return profiler.span(name)
@@ -0,0 +1,123 @@
+import gzip
+import json
+import re
+from types import MappingProxyType
+
+# 점수 표시 순서 (데이터에서 새로 발견된 점수는 뒤에 추가)
+SCORE_ORDER = ["A", "B", "C", "G", "P", "NP"]
+
+CHUNK_SIZE = 1 << 20
+
+_WHITESPACE = " \t\n\r"
+
+
+def order_labels(labels):
+    labels = set(labels)
+    known = [s for s in SCORE_ORDER if s in labels]
+    return known + sorted(labels - set(SCORE_ORDER))
+
+
+def applicant_key(result):
+    # 이름 + 생년월일 숫자만 사용 ("2003.07.01." 과 "2003.07.01" 을 같은 지원자로 취급)
+    birth = re.sub(r"\D", "", str(result.get("user_birth", "")))
+    return f"{result.get('user_name', '').strip()}|{birth}"
+
+
+def freeze(value):
+    # 여러 세션이 함께 읽는 데이터 - 수정할 수 없는 dict(MappingProxyType)/tuple 로 변환
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def open_text(path):
+    # 지난 기수 아카이브(.gz)도 그대로 읽을 수 있도록
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, "r", encoding="utf-8", buffering=CHUNK_SIZE)
+
+
+def iter_json_array(f, chunk_size=CHUNK_SIZE):
+    # 최상위 JSON 배열을 원소 단위로 읽음 - 메모리에는 현재 버퍼와 원소 하나만 유지
+    decoder = json.JSONDecoder()
+    buf = ""
+    pos = 0
+    eof = False
+
+    def peek():
+        # 공백을 건너뛴 다음 글자 (버퍼가 공백뿐이면 더 읽음), 파일 끝이면 ""
+        nonlocal buf, pos, eof
+        while True:
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(buf):
+                return buf[pos]
+            if eof:
+                return ""
+            more = f.read(chunk_size)
+            eof = not more
+            buf = buf[pos:] + more
+            pos = 0
+
+    if peek() != "[":
+        raise ValueError("JSON 배열 형식의 결과 파일이 아닙니다.")
+    pos += 1
+    expect_value = peek() != "]"
+
+    while expect_value:
+        if not peek():
+            raise ValueError("JSON 배열이 닫히지 않았습니다.")
+        try:
+            obj, end = decoder.raw_decode(buf, pos)
+            # 숫자 등 버퍼 끝에서 잘렸을 수 있는 값은 더 읽은 뒤 다시 파싱
+            truncated = end == len(buf) and not eof
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            truncated = True
+
+        if truncated:
+            # 원소가 버퍼보다 크면 읽는 크기를 늘려 재파싱 횟수를 줄임
+            more = f.read(max(chunk_size, len(buf) - pos))
+            eof = not more
+            buf = buf[pos:] + more
+            pos = 0
+            continue
+
+        yield obj
+        pos = end
+        if pos >= chunk_size:
+            buf = buf[pos:]
+            pos = 0
+
+        # 원소 사이에는 쉼표가 정확히 하나 ("[1,,2]", "[1 2]" 는 오류)
+        separator = peek()
+        if separator == ",":
+            pos += 1
+            if peek() in ("]", ","):
+                raise ValueError("JSON 배열에 빈 원소가 있습니다.")
+        elif separator == "]":
+            expect_value = False
+        elif not separator:
+            raise ValueError("JSON 배열이 닫히지 않았습니다.")
+        else:
+            raise ValueError(f"JSON 배열 원소 사이에 ',' 가 없습니다: {separator!r}")
+
+    pos += 1
+    # 배열 뒤에 다른 내용이 붙어 있으면 (이어 붙인 아카이브 등) 오류
+    if peek():
+        raise ValueError("JSON 배열 뒤에 다른 내용이 있습니다.")
+
+
+def iter_results(path):
+    # .json (배열), .jsonl (한 줄에 한 명, 체크포인트), 각각의 .gz 압축본 지원
+    name = path[:-3] if path.endswith(".gz") else path
+    with open_text(path) as f:
+        if name.endswith(".jsonl"):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from iter_json_array(f)
@@ -0,0 +1,116 @@
+import heapq
+import statistics
+import threading
+
+from cache import JsonCache, fingerprint
+
+SCHEDULES = ["longest", "input"]
+
+latency_models = JsonCache("latency_models")
+
+
+def longest_first(sizes):
+    # 예상 토큰 수가 큰 지원자부터 (같으면 입력 순서)
+    return sorted(range(len(sizes)), key=lambda i: (-sizes[i], i))
+
+
+def simulate_makespan(durations, order, workers):
+    # 빈 작업자에게 순서대로 하나씩 맡길 때 마지막 작업이 끝나는 시각
+    free_at = [0.0] * max(1, min(workers, len(order)))
+    for i in order:
+        start = heapq.heappop(free_at)
+        heapq.heappush(free_at, start + durations[i])
+    return max(free_at) if order else 0.0
+
+
+class LatencyModel:
+    # 지연(초) = intercept + slope * 예상 토큰 수
+    def __init__(self, intercept, slope, samples=0):
+        self.intercept = intercept
+        self.slope = slope
+        self.samples = samples
+
+    def predict(self, tokens):
+        return max(0.0, self.intercept + self.slope * tokens)
+
+    @classmethod
+    def fit(cls, points):
+        if len(points) < 2:
+            return None
+        sizes = [size for size, _ in points]
+        latencies = [latency for _, latency in points]
+        if len(set(sizes)) < 2:
+            return cls(statistics.fmean(latencies), 0.0, len(points))
+        slope, intercept = statistics.linear_regression(sizes, latencies)
+        return cls(intercept, slope, len(points))
+
+    @classmethod
+    def load(cls, model):
+        # 같은 모델의 이전 실행에서 맞춘 값 (없으면 None)
+        data = latency_models.get(fingerprint("latency", model))
+        return cls(**data) if data else None
+
+    def save(self, model):
+        latency_models.set(
+            fingerprint("latency", model),
+            {
+                "intercept": self.intercept,
+                "slope": self.slope,
+                "samples": self.samples,
+            },
+        )
+
+
+class LatencyObserver:
+    # MetricsRecorder 기록에서 지원자별 (예상 토큰 수, 실제 지연) 수집
+    def __init__(self, sizes):
+        self.sizes = sizes
+        self.points = []
+        self.lock = threading.Lock()
+
+    def observe(self, entry):
+        if entry.get("error") or entry.get("stage") != "evaluate":
+            return
+        if entry.get("hedge") == "hedge" or entry.get("applicant") is None:
+            return
+        with self.lock:
+            self.points.append((self.sizes[entry["applicant"]], entry["latency"]))
+
+
+def makespan_report(
+    sizes, order, workers, actual, before=None, after=None, basis="고정"
+):
+    # 이전 실행 모델로 미리 계산한 값, 이번 실행으로 다시 맞춘 모델의 값, 실제 시간 비교
+    # basis: workers 를 어떻게 정했는지 (고정된 동시 요청 수, 자동 조절 중 시간 가중 평균 등)
+    rows = []
+    for label, model in [("이전 실행 모델", before), ("이번 실행 모델", after)]:
+        if model is None:
+            continue
+        durations = [model.predict(size) for size in sizes]
+        rows.append(
+            {
+                "model": label,
+                "predicted": simulate_makespan(durations, order, workers),
+                "input_order": simulate_makespan(durations, range(len(sizes)), workers),
+                "longest_first": simulate_makespan(
+                    durations, longest_first(sizes), workers
+                ),
+            }
+        )
+    return {
+        "actual": actual,
+        "workers": workers,
+        "workers_basis": basis,
+        "predictions": rows,
+    }
+
+
+def print_makespan(report):
+    print(
+        f"\n전체 소요 시간 (동시 {report['workers']}, {report['workers_basis']}): 실제 {report['actual']:.2f}초"
+    )
+    for row in report["predictions"]:
+        print(
+            f"  {row['model']}: 예상 {row['predicted']:.2f}초 "
+            f"(입력 순서 {row['input_order']:.2f}초, 긴 것 먼저 {row['longest_first']:.2f}초)"
+        )
@@ -0,0 +1,128 @@
+import json
+import math
+import os
+import threading
+from collections import Counter
+
+import numpy as np
+
+from cache import CACHE_DIR, fingerprint
+from results_io import applicant_key
+from term_stats import summary_terms
+
+DEFAULT_DIMENSIONS = 512
+
+# 단어 추출(불용어, 이름 제외)이 바뀌면 올려서 디스크에 저장된 행렬을 다시 만듦
+VOCABULARY_VERSION = 3
+
+
+def applicant_terms(result):
+    return [
+        term
+        for summary in result.get("summarization", {}).values()
+        for term in summary_terms(result, summary)
+    ]
+
+
+def build_vocabulary(documents, dimensions):
+    # 한 명에게만 나온 단어는 유사도에 기여하지 않고, 절반 이상에게 나온 단어는 구분력이 없음
+    # 나머지 중 많이 나온 단어부터 dimensions 개 (같으면 가나다순)
+    frequency = Counter()
+    for document in documents:
+        frequency.update(set(document))
+    limit = max(2, len(documents) // 2)
+    candidates = [
+        (term, count) for term, count in frequency.items() if 2 <= count <= limit
+    ]
+    candidates.sort(key=lambda item: (-item[1], item[0]))
+    vocabulary = [term for term, _ in candidates[:dimensions]]
+    idf = np.array(
+        [
+            math.log((1 + len(documents)) / (1 + frequency[term])) + 1
+            for term in vocabulary
+        ],
+        dtype=np.float32,
+    )
+    return vocabulary, idf
+
+
+class SimilarityIndex:
+    # 지원자마다 요약 전체의 TF-IDF 벡터 (L2 정규화) - 행 i 는 results 안의 위치 i
+    def __init__(self, matrix, vocabulary, keys):
+        self.matrix = matrix
+        self.vocabulary = vocabulary
+        self.keys = keys
+
+    @classmethod
+    def build(cls, results, dimensions=DEFAULT_DIMENSIONS):
+        documents = [applicant_terms(result) for result in results]
+        vocabulary, idf = build_vocabulary(documents, dimensions)
+        columns = {term: column for column, term in enumerate(vocabulary)}
+
+        matrix = np.zeros((len(documents), len(vocabulary)), dtype=np.float32)
+        for row, document in enumerate(documents):
+            for term, count in Counter(document).items():
+                column = columns.get(term)
+                if column is not None:
+                    # 반복 횟수는 로그로 완화
+                    matrix[row, column] = 1 + math.log(count)
+        matrix *= idf
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return cls(matrix, vocabulary, [applicant_key(result) for result in results])
+
+    def save(self, directory):
+        # 행렬은 .npy 그대로 (불러올 때 메모리 매핑), 임시 파일에 쓴 뒤 교체
+        os.makedirs(directory, exist_ok=True)
+        suffix = f"{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(os.path.join(directory, f"matrix.npy.{suffix}"), "wb") as f:
+            np.save(f, self.matrix)
+        with open(os.path.join(directory, f"index.json.{suffix}"), "w") as f:
+            json.dump(
+                {"vocabulary": self.vocabulary, "keys": self.keys},
+                f,
+                ensure_ascii=False,
+            )
+        for name in ["matrix.npy", "index.json"]:
+            os.replace(
+                os.path.join(directory, f"{name}.{suffix}"),
+                os.path.join(directory, name),
+            )
+
+    @classmethod
+    def load(cls, directory):
+        try:
+            with open(os.path.join(directory, "index.json"), "r") as f:
+                data = json.load(f)
+            matrix = np.load(os.path.join(directory, "matrix.npy"), mmap_mode="r")
+        except (FileNotFoundError, ValueError):
+            return None
+        if matrix.shape != (len(data["keys"]), len(data["vocabulary"])):
+            return None
+        return cls(matrix, data["vocabulary"], data["keys"])
+
+    def similar(self, position, k=5):
+        # [(위치, 코사인 유사도), ...] 높은 순, 자기 자신 제외
+        scores = self.matrix @ self.matrix[position]
+        scores[position] = -np.inf
+        k = min(k, len(scores) - 1)
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(int(i), float(scores[i])) for i in top if scores[i] > 0]
+
+
+def load_or_build(results, path, mtime, dimensions=DEFAULT_DIMENSIONS):
+    # 결과 파일 경로/수정 시각마다 디스크에 한 번 저장 - 다음 시작부터는 불러오기만 함
+    directory = os.path.join(
+        CACHE_DIR,
+        "similarity",
+        fingerprint("similarity", path, mtime, dimensions, VOCABULARY_VERSION),
+    )
+    index = SimilarityIndex.load(directory)
+    if index is not None and index.keys == [applicant_key(r) for r in results]:
+        return index
+    index = SimilarityIndex.build(results, dimensions)
+    index.save(directory)
+    return index
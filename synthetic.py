@@ -0,0 +1,352 @@
+import argparse
+import csv
+import gzip
+import json
+import math
+import os
+import multiprocessing
+import random
+import time
+
+from monitor import TARGET_QUOTAS
+
+# 기본 점수 분포 - 평가 기준표의 목표 비율 + 성실성
+DEFAULT_SCORE_DISTRIBUTIONS = {
+    **TARGET_QUOTAS,
+    "성실성(성의)": {"P": 0.9, "NP": 0.1},
+}
+
+EXPLANATION_KEYS = {
+    "지원 동기 및 진정성": "goal_alignment_explanation",
+    "논리적 표현력": "logical_expression_explanation",
+    "활동경험": "activity_experience_explanation",
+    "성실성(성의)": "diligence_explanation",
+}
+
+# 시드를 나누는 단위 (블록 단위로 병렬 생성)
+BLOCK_SIZE = 10_000
+
+QUESTIONS = [
+    ("BIT에 지원한 동기에 대해 자세히 서술해 주세요.", 500),
+    (
+        "본인이 인생에서 가장 이루고 싶은 것과 이루기 위한 계획을 구체적으로 설명해주세요.",
+        800,
+    ),
+    (
+        "대학교 입학 후, 본인의 성장을 위해서 했던 가장 난이도 있는 도전에 대해서 자세히 설명해주세요.",
+        1000,
+    ),
+]
+
+SURNAMES = "김이박최정강조윤장임한오서신권황안송류전홍고문양손배백허유남심노하곽성차주우구민진나"
+GIVEN_SYLLABLES = (
+    "민서지현수준도윤하은예성우진영채원태연건희유나재아승주혜소정시동규빈경"
+)
+
+FIELDS = [
+    "HR",
+    "전략 컨설팅",
+    "VC 투자",
+    "마케팅",
+    "스타트업 창업",
+    "데이터 분석",
+    "금융",
+    "ESG 경영",
+    "해외영업",
+    "서비스 기획",
+]
+ACTIVITIES = [
+    "교내 창업 동아리",
+    "경영 전략 학회",
+    "공모전 팀",
+    "AIESEC 지부",
+    "교내 방송국",
+    "스타트업 인턴십",
+    "봉사 프로젝트",
+    "교환학기",
+    "산학협력 프로젝트",
+    "학생회",
+]
+OUTCOMES = [
+    "대상을 수상했습니다",
+    "목표 대비 두 배의 성과를 냈습니다",
+    "팀을 끝까지 이끌었습니다",
+    "실제 서비스로 출시했습니다",
+    "기업의 제안으로 이어졌습니다",
+    "다음 기수의 기반을 만들었습니다",
+]
+
+SENTENCES = [
+    "저는 {field} 분야에서 의미 있는 변화를 만드는 사람이 되고 싶습니다.",
+    "BIT의 실전 프로젝트와 산학협력은 이론을 넘어서는 경험을 제공한다고 생각합니다.",
+    "{activity}에서 활동하며 문제를 정의하고 해결하는 과정의 중요성을 배웠습니다.",
+    "처음에는 팀원들과 일정을 조율하는 것조차 쉽지 않았습니다.",
+    "저는 업무를 세분화하고 매주 진행 상황을 공유하는 방식으로 문제를 해결했습니다.",
+    "그 결과 프로젝트는 {outcome}.",
+    "이 경험을 통해 데이터에 기반한 의사결정의 힘을 체감했습니다.",
+    "단기적으로는 실무 역량을 쌓고, 장기적으로는 {field} 전문가로 성장하는 것이 목표입니다.",
+    "다양한 배경을 가진 동료들과 치열하게 토론하며 시야를 넓히고 싶습니다.",
+    "끊임없이 질문하고 본질을 탐구하는 BIT의 문화에 깊이 공감했습니다.",
+    "{activity} 활동 중 가장 어려웠던 점은 한정된 자원 안에서 우선순위를 정하는 일이었습니다.",
+    "고객 인터뷰와 시장 조사를 통해 가설을 검증하고 방향을 수정했습니다.",
+    "실패를 두려워하지 않고 다시 도전하는 태도가 저의 가장 큰 강점입니다.",
+    "BIT에서의 경험이 제 커리어의 방향을 구체화하는 계기가 될 것이라 확신합니다.",
+    "저는 책임감을 가지고 학회 활동에 성실하게 임하겠습니다.",
+    "{field} 산업의 구조적인 문제를 해결하는 전략을 직접 세워보고 싶습니다.",
+]
+
+SUMMARY_SENTENCES = [
+    "{name}은(는) {field} 분야의 실무 역량을 쌓기 위해 BIT에 지원했다.",
+    "{activity} 경험을 통해 협업과 문제 해결의 중요성을 배웠다고 서술했다.",
+    "장기적으로 {field} 전문가로 성장하는 것을 목표로 한다.",
+    "프로젝트는 {outcome} 이라고 밝혔다.",
+    "BIT의 실전 프로젝트와 네트워크를 통해 성장하고자 한다.",
+]
+
+
+def make_name(rng):
+    return rng.choice(SURNAMES) + "".join(rng.choices(GIVEN_SYLLABLES, k=2))
+
+
+def make_birth(rng):
+    year = rng.randint(1998, 2006)
+    month = rng.randint(1, 12)
+    day = rng.randint(1, 28)
+    # 실제 데이터처럼 가끔 다른 형식이 섞임
+    style = rng.random()
+    if style < 0.9:
+        return f"{year}.{month:02d}.{day:02d}"
+    if style < 0.95:
+        return f"{year}{month:02d}{day:02d}"
+    return f"{year % 100:02d}{month:02d}{day:02d}"
+
+
+def fill(rng, template, **values):
+    return template.format(
+        field=values.get("field") or rng.choice(FIELDS),
+        activity=values.get("activity") or rng.choice(ACTIVITIES),
+        outcome=rng.choice(OUTCOMES),
+        name=values.get("name", ""),
+    )
+
+
+def make_answer(rng, limit, field, activity):
+    # 글자 수 제한의 85~100% 분량으로 문장을 이어 붙임
+    target = int(limit * rng.uniform(0.85, 1.0))
+    parts = []
+    length = 0
+    while length < target:
+        sentence = fill(rng, rng.choice(SENTENCES), field=field, activity=activity)
+        parts.append(sentence)
+        length += len(sentence) + 1
+    return " ".join(parts)[:limit]
+
+
+def generate_form(rng):
+    name = make_name(rng)
+    sex = rng.choice(["남", "여"])
+    field = rng.choice(FIELDS)
+    activity = rng.choice(ACTIVITIES)
+
+    sections = []
+    for number, (question, limit) in enumerate(QUESTIONS, 1):
+        answer = make_answer(rng, limit, field, activity)
+        sections.append(
+            f"{number}) {question} (공백 포함 {limit}자 이내) * 글자 수 : {len(answer)}자\n\n{answer}\n"
+        )
+    return {
+        "user_info": f"""성명 {name} 성별 {sex}
+        생년월일 {make_birth(rng)}
+        """,
+        "application_form": "\n" + "\n".join(sections),
+    }
+
+
+def draw(rng, distribution):
+    scores = list(distribution)
+    return rng.choices(scores, weights=[distribution[s] for s in scores])[0]
+
+
+def generate_result(rng, distributions):
+    name = make_name(rng)
+    field = rng.choice(FIELDS)
+    activity = rng.choice(ACTIVITIES)
+    summarization = {}
+    for number in range(1, len(QUESTIONS) + 1):
+        sentences = rng.sample(SUMMARY_SENTENCES, 3)
+        summarization[f"problem_{number}"] = " ".join(
+            fill(rng, s, name=name, field=field, activity=activity) for s in sentences
+        )
+
+    evaluation_result = {}
+    for category, distribution in distributions.items():
+        score = draw(rng, distribution)
+        key = EXPLANATION_KEYS.get(category, "explanation")
+        evaluation_result[category] = {
+            "score": score,
+            key: f"{activity} 경험과 {field} 목표를 근거로 {score}로 평가했다.",
+        }
+
+    return {
+        "user_name": name,
+        "user_sex": rng.choice(["남", "여"]),
+        "user_birth": make_birth(rng),
+        "summarization": summarization,
+        "evaluation_result": evaluation_result,
+    }
+
+
+def generate_block(args):
+    kind, block, count, seed, distributions = args
+    # 블록마다 독립된 시드 - 작업 프로세스 수와 관계없이 같은 데이터가 나옴
+    rng = random.Random(seed * 1_000_003 + block)
+    size = min(BLOCK_SIZE, count - block * BLOCK_SIZE)
+    if kind == "forms":
+        return [generate_form(rng) for _ in range(size)]
+    return [generate_result(rng, distributions) for _ in range(size)]
+
+
+def generate(kind, count, seed=0, distributions=None, workers=1):
+    distributions = distributions or DEFAULT_SCORE_DISTRIBUTIONS
+    blocks = [
+        (kind, block, count, seed, distributions)
+        for block in range(math.ceil(count / BLOCK_SIZE))
+    ]
+    if workers <= 1:
+        for block in blocks:
+            yield from generate_block(block)
+        return
+    # 블록 순서는 유지하면서 여러 프로세스에서 생성
+    with multiprocessing.Pool(workers) as pool:
+        for records in pool.imap(generate_block, blocks):
+            yield from records
+
+
+def generate_forms(count, seed=0):
+    return list(generate("forms", count, seed))
+
+
+def open_output(path):
+    if path.endswith(".gz"):
+        return gzip.open(path, "wt", encoding="utf-8", newline="")
+    return open(path, "w", encoding="utf-8", newline="", buffering=1 << 20)
+
+
+def flatten(record):
+    # 열 형식(CSV, Parquet) 저장용 평탄화
+    row = {}
+    for key, value in record.items():
+        if isinstance(value, dict):
+            for sub_key, sub_value in value.items():
+                if isinstance(sub_value, dict):
+                    for leaf_key, leaf_value in sub_value.items():
+                        row[f"{sub_key}.{leaf_key}"] = leaf_value
+                else:
+                    row[f"{key}.{sub_key}"] = sub_value
+        else:
+            row[key] = value
+    return row
+
+
+def write_json(records, path):
+    # 전체를 메모리에 올리지 않고 한 건씩 배열로 기록
+    with open_output(path) as f:
+        f.write("[")
+        for i, record in enumerate(records):
+            f.write(",\n" if i else "\n")
+            f.write(json.dumps(record, ensure_ascii=False))
+        f.write("\n]\n")
+
+
+def write_jsonl(records, path):
+    with open_output(path) as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False))
+            f.write("\n")
+
+
+def write_csv(records, path):
+    with open_output(path) as f:
+        writer = None
+        for record in records:
+            row = flatten(record)
+            if writer is None:
+                writer = csv.DictWriter(f, fieldnames=list(row))
+                writer.writeheader()
+            writer.writerow(row)
+
+
+def write_parquet(records, path, batch_size=100_000):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise SystemExit("parquet 형식은 pyarrow 가 필요합니다: pip install pyarrow")
+
+    writer = None
+    batch = []
+
+    def flush():
+        nonlocal writer
+        table = pa.Table.from_pylist(batch)
+        if writer is None:
+            writer = pq.ParquetWriter(path, table.schema, compression="zstd")
+        writer.write_table(table)
+        batch.clear()
+
+    for record in records:
+        batch.append(flatten(record))
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+    if writer is not None:
+        writer.close()
+
+
+WRITERS = {
+    "json": write_json,
+    "jsonl": write_jsonl,
+    "csv": write_csv,
+    "parquet": write_parquet,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="합성 지원자 데이터 생성")
+    parser.add_argument("count", type=int, help="생성할 지원자 수")
+    parser.add_argument("output", help="저장 경로 (.gz 로 끝나면 압축)")
+    parser.add_argument(
+        "--kind",
+        choices=["forms", "results"],
+        default="results",
+        help="forms: evaluation.py 입력(user_info/application_form), results: 평가 결과",
+    )
+    parser.add_argument("--format", choices=list(WRITERS), default="json")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count(), help="생성 프로세스 수"
+    )
+    parser.add_argument(
+        "--scores",
+        help='점수 분포 JSON (예: \'{"활동경험": {"G": 0.5, "NP": 0.5}}\'), 지정한 항목만 덮어씀',
+    )
+    args = parser.parse_args()
+
+    distributions = dict(DEFAULT_SCORE_DISTRIBUTIONS)
+    if args.scores:
+        distributions.update(json.loads(args.scores))
+
+    start = time.perf_counter()
+    WRITERS[args.format](
+        generate(args.kind, args.count, args.seed, distributions, args.workers),
+        args.output,
+    )
+    elapsed = time.perf_counter() - start
+    print(
+        f"{args.count}건 생성 완료: {args.output} ({elapsed:.1f}초, {args.count / elapsed:,.0f}건/초)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+import functools
+import heapq
+import math
+import re
+from collections import Counter
+
+ALL_PROBLEMS = "전체 문항"
+
+# 불용어 - 어느 지원서에나 나오는 연결어/지시어
+STOPWORDS = {
+    "있는",
+    "하는",
+    "그리고",
+    "그런",
+    "이런",
+    "저는",
+    "이것",
+    "정도",
+    "지원자",
+    "있다",
+    "있으며",
+    "통해",
+    "위해",
+    "이를",
+    "대한",
+    "대해",
+    "대해서",
+    "한다",
+    "모든",
+    "자신",
+    "이러한",
+    "가장",
+    "것을",
+    "것이",
+    "그는",
+    "그녀",
+    "이는",
+    "위한",
+    "특히",
+    # 서술어 어미 - 요약문 문장 끝에 늘 붙는 말
+    "합니다",
+    "했습니다",
+    "있습니다",
+    "됩니다",
+    "입니다",
+    "것입니다",
+    "싶습니다",
+    "했다",
+    "하였다",
+    "되었다",
+    "하고",
+    "싶다",
+    "싶다고",
+    "되어",
+    "되었고",
+    "밝혔다",
+    "것이라고",
+    # 순서를 나타내는 말
+    "첫째",
+    "둘째",
+    "셋째",
+    "넷째",
+}
+
+# 자주 붙는 조사 - 떼고 남은 부분이 두 글자 이상일 때만 ("BIT에서", "BIT의" -> "BIT")
+PARTICLES = re.compile(
+    r"(에서|에게|으로|까지|부터|은|는|이|가|을|를|의|에|와|과|로|도|만)$"
+)
+
+# 조사처럼 끝나지만 명사의 일부인 말 - 이 말로 끝나면 더 떼지 않음 ("전문가", "재평가", "완벽주의")
+NOUN_ENDINGS = (
+    "전문가",
+    "창업가",
+    "기업가",
+    "사업가",
+    "투자가",
+    "예술가",
+    "활동가",
+    "전략가",
+    "기획가",
+    "혁신가",
+    "작가",
+    "평가",
+    "국가",
+    "증가",
+    "추가",
+    "참가",
+    "어린이",
+    "차이",
+    "아이",
+    "놀이",
+    "나이",
+    "높이",
+    "깊이",
+    "사이",
+    "주의",
+    "창의",
+    "강의",
+    "토의",
+    "의의",
+    "난이도",
+    "만족도",
+    "완성도",
+    "이해도",
+    "기여도",
+    "인지도",
+    "신뢰도",
+    "참여도",
+    "태도",
+    "제도",
+    "시도",
+    "의도",
+    "속도",
+    "지도",
+    "결과",
+    "효과",
+    "성과",
+    "학과",
+    "교과",
+    "진로",
+    "경로",
+    "스스로",
+)
+
+# 서술어 활용형 - 요약문의 "강조하며", "창출하는" 같은 말은 주제가 아님
+PREDICATE_ENDINGS = re.compile(
+    r"(하며|하고|하는|하여|해서|하면서|하기|하게|하려는|하려고|했던|하던"
+    r"|했고|했으며|하였고|하였으며|한다고|했다고|한다|했다|된다|되며|되는|되고|되기)$"
+)
+
+_WORD = re.compile(r"\w+")
+
+
+@functools.lru_cache(maxsize=200_000)
+def normalize(word):
+    # 조사를 뗀 단어, 불용어/한 글자/서술어면 None - 같은 어형이 반복되므로 결과를 기억해 둠
+    # 조사가 겹친 경우("사람들과의", "분야에서의")는 두 번까지 떼고, 복수형 "들"도 뗌
+    term = word
+    for _ in range(2):
+        if term.endswith(NOUN_ENDINGS):
+            break
+        stripped = PARTICLES.sub("", term)
+        if stripped == term or len(stripped) < 2:
+            break
+        term = stripped
+    if len(term) > 2 and term.endswith("들"):
+        term = term[:-1]
+    if PREDICATE_ENDINGS.search(word) or PREDICATE_ENDINGS.search(term):
+        return None
+    return term if len(term) > 1 and term not in STOPWORDS else None
+
+
+def terms(text):
+    words = (normalize(word) for word in _WORD.findall(text))
+    return [word for word in words if word]
+
+
+def name_terms(result):
+    # 지원자 본인 이름 (성을 뺀 이름 포함) - 요약문에 자주 나오지만 주제가 아님
+    # 조사를 뗄 때 이름 끝 글자가 같이 떨어질 수 있으므로("금산내들") 정리한 형태도 포함
+    name = str(result.get("user_name", "")).strip()
+    names = {name, name[1:]} if len(name) > 2 else {name}
+    return names | {normalize(name) for name in names}
+
+
+def summary_terms(result, summary):
+    names = name_terms(result)
+    return [term for term in terms(str(summary)) if term not in names]
+
+
+def tfidf(counts, idf, limit):
+    # [(단어, 빈도, TF-IDF), ...] TF-IDF 높은 순
+    top = heapq.nlargest(limit, counts.items(), key=lambda item: item[1] * idf[item[0]])
+    return [(term, count, count * idf[term]) for term, count in top]
+
+
+class TermStats:
+    # 데이터 버전마다 한 번 계산 - 문서 하나 = 지원자 한 명의 문항 하나
+    # 문서 빈도를 먼저 센 다음, 문서마다 TF-IDF 상위 단어만 남김 (전체 단어 빈도는 보관하지 않음)
+    def __init__(self, results, limit=10):
+        self.documents = 0
+        self.document_frequency = Counter()
+        self.problem_documents = Counter()
+        self.problem_frequency = {}
+        for result in results:
+            for problem, summary in result.get("summarization", {}).items():
+                unique = set(summary_terms(result, summary))
+                self.documents += 1
+                self.document_frequency.update(unique)
+                self.problem_documents[problem] += 1
+                self.problem_frequency.setdefault(problem, Counter()).update(unique)
+
+        # 부드럽게 한 idf - 모든 문서에 나오는 단어도 0 이 되지 않음
+        self.idf = {
+            term: math.log((1 + self.documents) / (1 + count)) + 1
+            for term, count in self.document_frequency.items()
+        }
+
+        self.top_terms = []
+        for result in results:
+            combined = Counter()
+            top = {}
+            for problem, summary in result.get("summarization", {}).items():
+                counts = Counter(summary_terms(result, summary))
+                combined.update(counts)
+                top[problem] = tfidf(counts, self.idf, limit)
+            top[ALL_PROBLEMS] = tfidf(combined, self.idf, limit)
+            self.top_terms.append(top)
+
+    def distinctive(self, position, problem=ALL_PROBLEMS):
+        # 지원자(results 안의 위치)의 특징적인 단어
+        return self.top_terms[position].get(problem, [])
+
+    def cohort_keywords(self, problem=None, limit=15):
+        # [(단어, 나온 지원서 비율), ...] - problem 이 없으면 전체 문항 기준
+        if problem is None:
+            frequency, total = self.document_frequency, self.documents
+        else:
+            frequency = self.problem_frequency.get(problem, Counter())
+            total = self.problem_documents[problem]
+        return [(term, count / total) for term, count in frequency.most_common(limit)]
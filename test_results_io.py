@@ -0,0 +1,50 @@
+import io
+import json
+
+import pytest
+
+from results_io import iter_json_array
+
+CHUNK_SIZES = [1, 2, 3, 5, 8, 64, 1 << 20]
+
+DOCUMENTS = [
+    "[]",
+    "  \n\t [ ] \n",
+    "[1]",
+    "[1,2,3]",
+    "  [  1 ,\n 2 , 3  ]  ",
+    "[12345678901234567890, -0.5e10, true, false, null]",
+    '["a,b", "]", "[", "\\"", "\\u00e9", "한글 ,]"]',
+    '[{"user_name": "홍길동", "summarization": {"problem_1": "요약 [1], 2"}}, [], {}]',
+    json.dumps([{"id": i, "text": "가" * i} for i in range(50)], ensure_ascii=False),
+    json.dumps([[i, [i, {"k": [i]}]] for i in range(20)], indent=4),
+]
+
+MALFORMED = [
+    "",
+    "   ",
+    "{}",
+    "[1,,2]",
+    "[1 2]",
+    "[1,]",
+    "[,1]",
+    "[1,2",
+    "[1,2,",
+    "[1][2]",
+    "[1] x",
+    '[{"a": 1]',
+]
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+@pytest.mark.parametrize("document", DOCUMENTS)
+def test_matches_json_load(document, chunk_size):
+    parsed = list(iter_json_array(io.StringIO(document), chunk_size=chunk_size))
+    assert parsed == json.loads(document)
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+@pytest.mark.parametrize("document", MALFORMED)
+def test_rejects_malformed(document, chunk_size):
+    with pytest.raises(ValueError):
+        list(iter_json_array(io.StringIO(document), chunk_size=chunk_size))
@@ -0,0 +1,204 @@
+import hashlib
+import heapq
+import html
+import json
+import math
+import re
+import threading
+from collections import Counter
+
+from results_io import applicant_key
+
+SUMMARY_SCOPE = "지원서 요약"
+
+K1 = 1.2
+B = 0.75
+
+_WORD = re.compile(r"\w+")
+
+
+def tokenize(text):
+    # 한국어는 띄어쓰기 단위가 조사/어미와 붙어 있으므로 글자 2-gram 사용 (한 글자 단어는 그대로)
+    tokens = []
+    for word in _WORD.findall(text.lower()):
+        if len(word) == 1:
+            tokens.append(word)
+        else:
+            tokens.extend(word[i : i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+def result_fields(result):
+    # (범위, 표시 이름, 본문) - 요약 문항과 평가 항목별 *_explanation
+    for problem, summary in result.get("summarization", {}).items():
+        yield SUMMARY_SCOPE, problem, str(summary)
+    for category, data in result.get("evaluation_result", {}).items():
+        for key, value in data.items():
+            if key.endswith("_explanation"):
+                yield category, f"{category} · {key}", str(value)
+
+
+def content_fingerprint(result):
+    # 색인하는 필드 내용의 해시 - 같은 지원자라도 요약이나 평가 근거가 바뀌면 달라짐
+    fields = json.dumps(list(result_fields(result)), ensure_ascii=False)
+    return hashlib.sha1(fields.encode("utf-8")).hexdigest()
+
+
+def highlight(text, query, width=80):
+    # 검색어 2-gram 이 나온 구간을 <mark> 로 감싼 발췌 (HTML 이스케이프 포함)
+    terms = set(tokenize(query))
+    lowered = text.lower()
+    spans = []
+    for term in terms:
+        start = lowered.find(term)
+        while start != -1:
+            spans.append((start, start + len(term)))
+            start = lowered.find(term, start + 1)
+    if not spans:
+        return html.escape(text[:width]) + ("…" if len(text) > width else "")
+
+    merged = []
+    for start, end in sorted(spans):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+
+    first = merged[0][0]
+    begin = max(0, first - width // 3)
+    finish = min(len(text), begin + width)
+    parts = ["…" if begin else ""]
+    position = begin
+    for start, end in merged:
+        if start >= finish:
+            break
+        parts.append(html.escape(text[position:start]))
+        parts.append(f"<mark>{html.escape(text[start:min(end, finish)])}</mark>")
+        position = min(end, finish)
+    parts.append(html.escape(text[position:finish]))
+    parts.append("…" if finish < len(text) else "")
+    return "".join(parts)
+
+
+class TextIndex:
+    # 역색인 + BM25 - 문서 하나 = 지원자 한 명의 필드 하나, 지원자 점수는 가장 잘 맞는 필드 점수
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.postings = {}
+        # 내용이 바뀐 지원자의 이전 필드는 None 으로 남김 (문서 번호가 바뀌지 않도록)
+        self.documents = []
+        self.lengths = []
+        self.total_length = 0
+        self.live = 0
+        self.keys = []
+        self.fingerprints = []
+        self.applicant_documents = []
+        self.version = None
+
+    def __len__(self):
+        return len(self.keys)
+
+    def add(self, result):
+        # 지원자 한 명 추가 - 통계(N, 평균 길이)는 검색할 때 계산하므로 다시 만들 필요 없음
+        self.keys.append(applicant_key(result))
+        self.fingerprints.append(None)
+        self.applicant_documents.append([])
+        self.index(len(self.keys) - 1, result)
+
+    def index(self, applicant, result):
+        self.fingerprints[applicant] = content_fingerprint(result)
+        for scope, label, text in result_fields(result):
+            tokens = tokenize(text)
+            doc = len(self.documents)
+            self.documents.append((applicant, scope, label, text))
+            self.applicant_documents[applicant].append(doc)
+            self.lengths.append(len(tokens))
+            self.total_length += len(tokens)
+            self.live += 1
+            for term, count in Counter(tokens).items():
+                self.postings.setdefault(term, {})[doc] = count
+
+    def replace(self, applicant, result):
+        # 같은 지원자의 내용이 바뀐 경우 - 이전 필드를 색인에서 빼고 새 필드를 추가
+        for doc in self.applicant_documents[applicant]:
+            for term in set(tokenize(self.documents[doc][3])):
+                postings = self.postings[term]
+                del postings[doc]
+                if not postings:
+                    del self.postings[term]
+            self.total_length -= self.lengths[doc]
+            self.live -= 1
+            self.documents[doc] = None
+        self.applicant_documents[applicant] = []
+        self.index(applicant, result)
+
+    def sync(self, results, version=None):
+        # 결과 파일에 새 지원자가 뒤에 추가됐으면 그 부분만 색인, 앞부분의 지원자가 바뀌었으면 새로 만듦
+        # 같은 지원자라도 다시 평가해서 요약/평가 근거가 바뀌었으면 그 지원자만 다시 색인
+        # version 이 같으면 (같은 데이터 버전) 확인 없이 바로 반환, 반환값은 새로 색인한 지원자 수
+        with self.lock:
+            if version is not None and version == self.version:
+                return 0
+            known = len(self.keys)
+            if len(results) < known or any(
+                applicant_key(results[i]) != self.keys[i] for i in range(known)
+            ):
+                self.reset()
+                known = 0
+            changed = [
+                i
+                for i in range(known)
+                if content_fingerprint(results[i]) != self.fingerprints[i]
+            ]
+            for i in changed:
+                self.replace(i, results[i])
+            for result in results[known:]:
+                self.add(result)
+            self.version = version
+            return len(changed) + len(results) - known
+
+    def search(self, query, scope=None, limit=20):
+        # ([(지원자 위치, 점수, 필드 표시 이름, 필드 본문), ...] 점수 높은 순, 찾은 지원자 수)
+        # 목록은 limit 명까지만, 지원자 수는 전체
+        terms = set(tokenize(query))
+        with self.lock:
+            count = self.live
+            if not terms or not count:
+                return [], 0
+            average = self.total_length / count
+            scores = Counter()
+            for term in terms:
+                postings = self.postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(
+                    1 + (count - len(postings) + 0.5) / (len(postings) + 0.5)
+                )
+                lengths = self.lengths
+                for doc, tf in postings.items():
+                    scores[doc] += (
+                        idf
+                        * tf
+                        * (K1 + 1)
+                        / (tf + K1 * (1 - B + B * lengths[doc] / average))
+                    )
+
+            best = {}
+            for doc, score in scores.items():
+                applicant, doc_scope, label, text = self.documents[doc]
+                if scope and doc_scope != scope:
+                    continue
+                if applicant not in best or score > best[applicant][0]:
+                    best[applicant] = (score, label, text)
+
+        ranked = heapq.nsmallest(
+            limit, best.items(), key=lambda item: (-item[1][0], item[0])
+        )
+        hits = [
+            (applicant, score, label, text)
+            for applicant, (score, label, text) in ranked
+        ]
+        return hits, len(best)